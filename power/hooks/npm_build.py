@@ -3,20 +3,472 @@
 Custom hooks for CMM Registration Site deployment.
 """
 
+import functools
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import mmap
 import os
 import subprocess
 import sys
 import logging
 import time
-import boto3
+import uuid
+from dotenv import dotenv_values
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Leave handler/level configuration to the host (CFNgin or the CLI below)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Cache headers applied to uploaded objects
+LONG_CACHE_CONTROL = "max-age=31536000"  # 1 year for static assets
+NO_CACHE_CONTROL = "no-cache, no-store, must-revalidate"
+NO_CACHE_SUFFIXES = (".html", ".json")
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+DELETE_CONCURRENCY = 8
+
+# Concurrent ListObjectsV2 paginators when listing a large bucket
+LIST_CONCURRENCY = 16
+
+# Content types for build artifacts that older Pythons or the host's
+# mime.types may not map; registered once so every PUT gets the right header
+CONTENT_TYPE_OVERRIDES = {
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".map": "application/json",
+    ".woff2": "font/woff2",
+    ".webmanifest": "application/manifest+json",
+    ".avif": "image/avif",
+    ".wasm": "application/wasm",
+}
+
+mimetypes.init()
+for _extension, _content_type in CONTENT_TYPE_OVERRIDES.items():
+    mimetypes.add_type(_content_type, _extension)
+
+# Text assets worth pre-compressing when compression is enabled
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".mjs", ".svg", ".json", ".map")
+COMPRESS_MIN_SIZE = 1024
+# Keep the gzipped body only if it is below this fraction of the original
+COMPRESS_MAX_RATIO = 0.9
+
+# Manifest of {key: md5} stored in the bucket to skip unchanged files
+MANIFEST_KEY = ".deploy-manifest.json"
+
+# Invalidation paths: collapse siblings to a wildcard above this many per
+# directory, and fall back to "/*" beyond CloudFront's per-batch path limit
+# or its limit on wildcard paths in progress per distribution
+INVALIDATION_SIBLING_THRESHOLD = 15
+MAX_INVALIDATION_PATHS = 3000
+MAX_INVALIDATION_WILDCARDS = 15
+
+# Invalidation polling: start fast for the common short case, back off to
+# the old fixed 30s cadence, and give up after 20 minutes
+INVALIDATION_POLL_INITIAL_DELAY = 5
+INVALIDATION_POLL_MAX_DELAY = 30
+INVALIDATION_WAIT_TIMEOUT = 1200
+
+# Upload concurrency (4x cores, capped to stay within the S3 connection pool)
+UPLOAD_CONCURRENCY = min(64, (os.cpu_count() or 1) * 4)
+
+
+@functools.lru_cache(maxsize=None)
+def _client(service: str, accelerate: bool = False) -> Any:
+    """
+    Return a process-wide boto3 client for the service, created on first use.
+
+    boto3/botocore are imported here rather than at module load, so importing
+    the hooks module stays cheap. Clients share a connection pool large enough
+    for the upload threads and adaptive retries for S3/CloudFront throttling.
+    """
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=UPLOAD_CONCURRENCY,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        tcp_keepalive=True,
+    )
+    if accelerate:
+        config = config.merge(Config(s3={"use_accelerate_endpoint": True}))
+    return boto3.Session().client(service, config=config)
+
+
+def _parse_accelerate(value: Union[bool, str]) -> Union[bool, str]:
+    """
+    Normalize the accelerate setting from a hook argument or the CLI.
+
+    Args:
+        value: True/False, or "true", "false" or "auto" in any case
+
+    Returns:
+        True, False or "auto"
+
+    Raises:
+        ValueError: If the value is anything else
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized == "auto":
+            return "auto"
+        if normalized in ("true", "false"):
+            return normalized == "true"
+    raise ValueError(
+        f"Invalid accelerate value {value!r}; expected true, false or auto"
+    )
+
+
+def _accelerate_not_configured(error: Exception) -> bool:
+    """Whether an S3 error means the bucket has no Transfer Acceleration."""
+    # upload_file wraps the ClientError in S3UploadFailedError, so match the text
+    message = str(error)
+    return "InvalidRequest" in message and "accelerat" in message.lower()
+
+
+def _use_accelerate(bucket_name: str, accelerate: Union[bool, str]) -> bool:
+    """
+    Decide whether uploads should go through S3 Transfer Acceleration.
+
+    Args:
+        bucket_name: Destination S3 bucket name
+        accelerate: True/False, or "auto" to use acceleration when the bucket
+            has it enabled
+
+    Returns:
+        bool: True if the accelerate endpoint should be used
+
+    Raises:
+        ValueError: If accelerate is not true, false or "auto"
+    """
+    from botocore.exceptions import ClientError
+
+    accelerate = _parse_accelerate(accelerate)
+    if accelerate != "auto":
+        return accelerate
+
+    try:
+        response = _client("s3").get_bucket_accelerate_configuration(
+            Bucket=bucket_name
+        )
+    except ClientError as e:
+        logger.warning(f"Could not read transfer acceleration status: {str(e)}")
+        return False
+
+    enabled = response.get("Status") == "Enabled"
+    logger.info(f"Transfer acceleration {'enabled' if enabled else 'not enabled'}")
+    return enabled
+
+
+def _upload_extra_args(key: str) -> Dict[str, str]:
+    """
+    Build the ExtraArgs for an object so headers are set in the initial PUT.
+
+    Args:
+        key: S3 object key
+
+    Returns:
+        Dict with ContentType and CacheControl for the object
+    """
+    content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+    if key.endswith(NO_CACHE_SUFFIXES):
+        cache_control = NO_CACHE_CONTROL
+    else:
+        cache_control = LONG_CACHE_CONTROL
+    return {"ContentType": content_type, "CacheControl": cache_control}
+
+
+def _list_bucket_keys(s3_client: Any, bucket_name: str) -> Set[str]:
+    """
+    List every object key currently stored in the bucket.
+
+    Buckets that fit in a single page are listed with one request. Larger
+    buckets are listed per top-level prefix, with the prefixes paged
+    concurrently instead of walking one serial paginator.
+    """
+    first_page = s3_client.list_objects_v2(Bucket=bucket_name)
+    keys = {obj["Key"] for obj in first_page.get("Contents", [])}
+    if not first_page.get("IsTruncated"):
+        return keys
+
+    paginator = s3_client.get_paginator("list_objects_v2")
+    prefixes = []
+    for page in paginator.paginate(Bucket=bucket_name, Delimiter="/"):
+        keys.update(obj["Key"] for obj in page.get("Contents", []))
+        prefixes.extend(prefix["Prefix"] for prefix in page.get("CommonPrefixes", []))
+
+    def list_prefix(prefix: str) -> List[str]:
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    with ThreadPoolExecutor(max_workers=LIST_CONCURRENCY) as executor:
+        for prefix_keys in executor.map(list_prefix, prefixes):
+            keys.update(prefix_keys)
+    return keys
+
+
+def _file_md5(path: Path) -> str:
+    """Compute the MD5 hex digest of a file via a read-only memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be memory-mapped
+            return hashlib.md5().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.md5(mapped).hexdigest()
+
+
+def _load_manifest(s3_client: Any, bucket_name: str) -> Optional[Dict[str, str]]:
+    """
+    Fetch the deploy manifest from the previous sync.
+
+    Returns:
+        Dict of {key: md5}, or None if no manifest exists
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=MANIFEST_KEY)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None
+        raise
+    return json.loads(response["Body"].read())
+
+
+def _delete_keys(s3_client: Any, bucket_name: str, keys: List[str]) -> None:
+    """Delete keys from the bucket in concurrent DeleteObjects batches."""
+
+    def delete_batch(batch: List[str]) -> None:
+        response = s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        for error in response.get("Errors", []):
+            logger.warning(f"Failed to delete {error['Key']}: {error['Message']}")
+
+    batches = [
+        keys[i : i + DELETE_BATCH_SIZE] for i in range(0, len(keys), DELETE_BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=DELETE_CONCURRENCY) as executor:
+        list(executor.map(delete_batch, batches))
+
+
+def sync_directory_to_s3(
+    output_dir: Path,
+    bucket_name: str,
+    s3_client: Optional[Any] = None,
+    accelerate: Union[bool, str] = False,
+    compress: bool = False,
+    on_first_page: Optional[Callable[[], None]] = None,
+) -> bool:
+    """
+    Upload a build output directory to S3 and remove stale objects.
+
+    Local files are hashed and compared against the manifest written by the
+    previous sync, so only changed files are uploaded. Each file is uploaded
+    with its Content-Type and Cache-Control set on the PUT, and static assets
+    are uploaded before HTML/JSON so pages never reference assets that are not
+    yet in the bucket. Objects that no longer exist locally are deleted and the
+    manifest is rewritten afterwards.
+
+    With ``compress`` enabled, text assets above 1 KB are gzipped in memory and
+    uploaded with ``Content-Encoding: gzip`` when that saves at least 10%;
+    files on disk are not modified.
+
+    If acceleration was requested but the bucket does not have it enabled,
+    the sync is retried through the standard S3 endpoint.
+
+    Args:
+        output_dir: Local directory to upload
+        bucket_name: Destination S3 bucket name
+        s3_client: Optional boto3 S3 client (created if not provided)
+        accelerate: Use S3 Transfer Acceleration (True/False/"auto")
+        compress: Gzip text assets before upload
+        on_first_page: Called once the first changed HTML/JSON file is uploaded
+            (or after the assets if no pages changed)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    accelerated = False
+    if s3_client is None:
+        accelerated = _use_accelerate(bucket_name, accelerate)
+        s3_client = _client("s3", accelerated)
+    transfer_config = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        max_concurrency=UPLOAD_CONCURRENCY,
+        use_threads=True,
+    )
+
+    files = {
+        path.relative_to(output_dir).as_posix(): path
+        for path in output_dir.rglob("*")
+        if path.is_file()
+    }
+
+    # Resolve headers once per extension present instead of once per file
+    extra_args_by_suffix = {
+        suffix: _upload_extra_args(f"index{suffix}")
+        for suffix in {os.path.splitext(key)[1] for key in files}
+    }
+
+    compressed = {
+        key
+        for key, path in files.items()
+        if compress
+        and key.endswith(COMPRESSIBLE_SUFFIXES)
+        and path.stat().st_size > COMPRESS_MIN_SIZE
+    }
+
+    def upload(key: str) -> None:
+        extra_args = extra_args_by_suffix[os.path.splitext(key)[1]]
+        if key in compressed:
+            raw = files[key].read_bytes()
+            # mtime=0 keeps the gzip output deterministic across deploys
+            body = gzip.compress(raw, compresslevel=6, mtime=0)
+            if len(body) < COMPRESS_MAX_RATIO * len(raw):
+                s3_client.upload_fileobj(
+                    io.BytesIO(body),
+                    bucket_name,
+                    key,
+                    ExtraArgs={**extra_args, "ContentEncoding": "gzip"},
+                    Config=transfer_config,
+                )
+                return
+            s3_client.upload_fileobj(
+                io.BytesIO(raw),
+                bucket_name,
+                key,
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+            )
+        else:
+            s3_client.upload_file(
+                str(files[key]),
+                bucket_name,
+                key,
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+            )
+
+    try:
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+            # hashlib releases the GIL, so hashing parallelizes across threads
+            manifest = dict(zip(files, executor.map(_file_md5, files.values())))
+            # Record that compression was considered so toggling it re-uploads
+            # the file; the keep-or-skip decision follows from the content
+            for key in compressed:
+                manifest[key] += ":gzip"
+            previous = _load_manifest(s3_client, bucket_name)
+            previous_hashes = previous or {}
+
+            changed = [
+                key for key in files if previous_hashes.get(key) != manifest[key]
+            ]
+            assets = [key for key in changed if not key.endswith(NO_CACHE_SUFFIXES)]
+            pages = [key for key in changed if key.endswith(NO_CACHE_SUFFIXES)]
+            logger.info(f"{len(changed)} of {len(files)} files changed since last sync")
+
+            logger.info(f"Uploading {len(assets)} static assets files")
+            list(executor.map(upload, assets))
+
+            logger.info(f"Uploading {len(pages)} HTML/JSON files")
+            pending = {executor.submit(upload, key) for key in pages}
+            if pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            if on_first_page and changed:
+                on_first_page()
+            for future in pending:
+                future.result()
+
+        # Without a manifest fall back to listing the bucket for stale objects
+        if previous is None:
+            existing = _list_bucket_keys(s3_client, bucket_name)
+        else:
+            existing = set(previous)
+        stale_keys = sorted(existing - set(files) - {MANIFEST_KEY})
+        if stale_keys:
+            logger.info(f"Deleting {len(stale_keys)} stale objects")
+            _delete_keys(s3_client, bucket_name, stale_keys)
+
+        s3_client.put_object(
+            Bucket=bucket_name,
+            Key=MANIFEST_KEY,
+            Body=json.dumps(manifest, sort_keys=True).encode("utf-8"),
+            ContentType="application/json",
+            CacheControl=NO_CACHE_CONTROL,
+        )
+
+    except Exception as e:
+        if accelerated and _accelerate_not_configured(e):
+            logger.warning(
+                "Transfer acceleration is not enabled on the bucket, "
+                "retrying through the standard S3 endpoint"
+            )
+            return sync_directory_to_s3(
+                output_dir,
+                bucket_name,
+                _client("s3"),
+                compress=compress,
+                on_first_page=on_first_page,
+            )
+        logger.error(f"S3 sync failed: {str(e)}")
+        return False
+
+    logger.info(f"S3 sync completed successfully ({len(changed)} files uploaded)")
+    return True
+
+
+def _scan_dir(path: Path) -> Dict[str, os.DirEntry]:
+    """Read a directory once and index its entries by name."""
+    with os.scandir(path) as it:
+        return {entry.name: entry for entry in it}
+
+
+def _run_streamed(
+    cmd: List[str], cwd: Path, env: Optional[Dict[str, str]] = None
+) -> int:
+    """
+    Run a command, streaming its combined stdout/stderr to the logger.
+
+    Args:
+        cmd: Command and arguments to execute
+        cwd: Directory to run the command in
+        env: Environment for the process (defaults to the current environment)
+
+    Returns:
+        int: Process exit code
+    """
+    logger.info(f"Executing: {' '.join(cmd)}")
+    # The context manager closes the pipe and reaps the child even if
+    # logging or the read loop raises
+    with subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as process:
+        for line in process.stdout:
+            logger.info(line.rstrip())
+        return process.wait()
 
 
 def build_and_sync_app(context: Dict[str, Any], provider: Any, **kwargs) -> bool:
@@ -30,6 +482,13 @@ def build_and_sync_app(context: Dict[str, Any], provider: Any, **kwargs) -> bool
             - bucket_name: S3 bucket name (from stack output)
             - app_path: Path to the app directory (default: './app')
             - environment: Environment name for .env file selection
+            - accelerate: Upload through S3 Transfer Acceleration; true,
+              false or "auto" to detect from the bucket (default: False)
+            - compress: Gzip text assets and upload them with
+              Content-Encoding: gzip (default: False)
+            - distribution_id: CloudFront distribution to invalidate ('/*');
+              the invalidation starts as soon as the first page is uploaded
+              so it overlaps the rest of the sync (optional)
 
     Returns:
         bool: True if successful, False otherwise
@@ -39,6 +498,9 @@ def build_and_sync_app(context: Dict[str, Any], provider: Any, **kwargs) -> bool
         bucket_name = kwargs.get("bucket_name")
         app_path = kwargs.get("app_path", "./app")
         environment = kwargs.get("environment", "dev")
+        accelerate = _parse_accelerate(kwargs.get("accelerate", False))
+        compress = kwargs.get("compress", False)
+        distribution_id = kwargs.get("distribution_id")
 
         if not bucket_name:
             logger.error("bucket_name parameter is required")
@@ -50,161 +512,193 @@ def build_and_sync_app(context: Dict[str, Any], provider: Any, **kwargs) -> bool
         # Convert to absolute path
         app_dir = Path(app_path).resolve()
 
-        if not app_dir.exists():
+        # One directory read answers every existence check before the build
+        try:
+            entries = _scan_dir(app_dir)
+        except (FileNotFoundError, NotADirectoryError):
             logger.error(f"App directory does not exist: {app_dir}")
             return False
 
-        # Change to app directory
-        original_cwd = os.getcwd()
-        os.chdir(app_dir)
+        # Overlay the environment-specific .env file onto the build environment
+        env_file = app_dir / f".env.{environment}"
+        build_env = os.environ.copy()
+
+        if env_file.name in entries:
+            env_values = {
+                key: value
+                for key, value in dotenv_values(env_file).items()
+                if value is not None
+            }
+            build_env.update(env_values)
+            logger.info(f"Loaded {len(env_values)} variables from {env_file.name}")
+        else:
+            logger.warning(f"Environment file {env_file.name} not found, skipping")
+
+        # Check if node_modules exists, if not run npm install
+        if "node_modules" not in entries:
+            logger.info("node_modules not found, running npm install...")
+            returncode = _run_streamed(["npm", "install"], cwd=app_dir)
+            if returncode != 0:
+                logger.error(f"npm install failed with exit code {returncode}")
+                return False
+            logger.info("npm install completed successfully")
 
-        try:
-            # Copy environment-specific .env file
-            env_file_src = f".env.{environment}"
-            env_file_dest = ".env.local"
+        # Run npm run build
+        logger.info("Running npm run build...")
+        returncode = _run_streamed(["npm", "run", "build"], cwd=app_dir, env=build_env)
+        if returncode != 0:
+            logger.error(f"npm run build failed with exit code {returncode}")
+            return False
+        logger.info("Build completed successfully")
+
+        # Determine output directory (Next.js uses 'out' for static export,
+        # falling back to .next if out doesn't exist)
+        entries = _scan_dir(app_dir)
+        for name in ("out", ".next"):
+            if name in entries and entries[name].is_dir():
+                output_dir = app_dir / name
+                break
+        else:
+            logger.error("No build output directory found (out or .next)")
+            return False
 
-            if Path(env_file_src).exists():
-                logger.info(f"Copying {env_file_src} to {env_file_dest}")
-                subprocess.run(["cp", env_file_src, env_file_dest], check=True)
-            else:
-                logger.warning(f"Environment file {env_file_src} not found, skipping")
+        logger.info(f"Using output directory: {output_dir}")
+
+        # Sync to S3 with delete semantics and per-object headers
+        logger.info(f"Syncing {output_dir} to s3://{bucket_name}/")
+        with ThreadPoolExecutor(max_workers=1) as invalidation_executor:
+            invalidations = []
 
-            # Check if node_modules exists, if not run npm install
-            if not Path("node_modules").exists():
-                logger.info("node_modules not found, running npm install...")
-                result = subprocess.run(
-                    ["npm", "install"], capture_output=True, text=True
+            def start_invalidation() -> None:
+                invalidations.append(
+                    invalidation_executor.submit(
+                        _create_invalidation, distribution_id, ["/*"]
+                    )
                 )
-                if result.returncode != 0:
-                    logger.error(f"npm install failed: {result.stderr}")
-                    return False
-                logger.info("npm install completed successfully")
 
-            # Run npm run build
-            logger.info("Running npm run build...")
-            result = subprocess.run(
-                ["npm", "run", "build"], capture_output=True, text=True
+            synced = sync_directory_to_s3(
+                output_dir,
+                bucket_name,
+                accelerate=accelerate,
+                compress=compress,
+                on_first_page=start_invalidation if distribution_id else None,
             )
-            if result.returncode != 0:
-                logger.error(f"npm run build failed: {result.stderr}")
-                return False
-            logger.info("Build completed successfully")
-
-            # Determine output directory (Next.js uses 'out' for static export)
-            output_dir = Path("out")
-            if not output_dir.exists():
-                # Fallback to .next/static if out doesn't exist
-                output_dir = Path(".next")
-                if not output_dir.exists():
-                    logger.error("No build output directory found (out or .next)")
+            for invalidation in invalidations:
+                try:
+                    invalidation.result()
+                except Exception as e:
+                    logger.error(f"CloudFront invalidation failed: {str(e)}")
                     return False
 
-            logger.info(f"Using output directory: {output_dir}")
-
-            # Sync to S3 with delete flag
-            logger.info(f"Syncing {output_dir} to s3://{bucket_name}/")
-
-            # Build AWS CLI sync command
-            sync_cmd = [
-                "aws",
-                "s3",
-                "sync",
-                str(output_dir),
-                f"s3://{bucket_name}/",
-                "--delete",
-                "--cache-control",
-                "max-age=31536000",  # 1 year for static assets
-                # '--exclude', '*.html',
-                # '--exclude', '*.json'
-            ]
+        if not synced:
+            return False
 
-            # Sync static assets with long cache
-            result = subprocess.run(sync_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"S3 sync (static assets) failed: {result.stderr}")
-                return False
+        logger.info("Build and sync process completed successfully")
+        return True
 
-            # Sync HTML and JSON files with no cache
-            html_sync_cmd = [
-                "aws",
-                "s3",
-                "sync",
-                str(output_dir),
-                f"s3://{bucket_name}/",
-                "--delete",
-                "--cache-control",
-                "no-cache, no-store, must-revalidate",
-                "--include",
-                "*.html",
-                "--include",
-                "*.json",
-                "--exclude",
-                "*",
-            ]
+    except Exception as e:
+        logger.error(f"Build and sync failed with error: {str(e)}")
+        return False
 
-            result = subprocess.run(html_sync_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"S3 sync (HTML/JSON) failed: {result.stderr}")
-                return False
 
-            logger.info("S3 sync completed successfully")
-
-            # Set proper content types for specific files
-            logger.info("Setting content types...")
-
-            # Set content-type for HTML files
-            subprocess.run(
-                [
-                    "aws",
-                    "s3",
-                    "cp",
-                    f"s3://{bucket_name}/",
-                    f"s3://{bucket_name}/",
-                    "--recursive",
-                    "--exclude",
-                    "*",
-                    "--include",
-                    "*.html",
-                    "--content-type",
-                    "text/html",
-                    "--metadata-directive",
-                    "REPLACE",
-                ],
-                capture_output=True,
-            )
+def _compress_paths(paths: List[str]) -> List[str]:
+    """
+    Reduce a list of invalidation paths to fewer, equivalent paths.
 
-            # Set content-type for JSON files
-            subprocess.run(
-                [
-                    "aws",
-                    "s3",
-                    "cp",
-                    f"s3://{bucket_name}/",
-                    f"s3://{bucket_name}/",
-                    "--recursive",
-                    "--exclude",
-                    "*",
-                    "--include",
-                    "*.json",
-                    "--content-type",
-                    "application/json",
-                    "--metadata-directive",
-                    "REPLACE",
-                ],
-                capture_output=True,
-            )
+    Duplicates are dropped, directories with many sibling paths collapse to
+    a single ``dir/*`` wildcard, and paths already covered by a wildcard are
+    removed. Falls back to ``['/*']`` when the result exceeds CloudFront's
+    per-invalidation path limit or its wildcard limit.
 
-            logger.info("Content types set successfully")
-            logger.info("Build and sync process completed successfully")
-            return True
+    Args:
+        paths: Paths to invalidate
 
-        finally:
-            # Always return to original directory
-            os.chdir(original_cwd)
+    Returns:
+        List of paths covering at least the same objects
+    """
+    siblings: Dict[str, List[str]] = {}
+    for path in dict.fromkeys(paths):
+        siblings.setdefault(path.rsplit("/", 1)[0], []).append(path)
+
+    compressed = []
+    for parent, children in siblings.items():
+        if len(children) > INVALIDATION_SIBLING_THRESHOLD:
+            compressed.append(f"{parent}/*")
+        else:
+            compressed.extend(children)
+
+    prefixes = {path[:-1] for path in compressed if path.endswith("*")}
+    result = [
+        path
+        for path in dict.fromkeys(compressed)
+        if not any(
+            path.startswith(prefix) and path != f"{prefix}*" for prefix in prefixes
+        )
+    ]
+
+    wildcards = sum(1 for path in result if path.endswith("*"))
+    if len(result) > MAX_INVALIDATION_PATHS or wildcards > MAX_INVALIDATION_WILDCARDS:
+        return ["/*"]
+    return result
+
+
+def _create_invalidation(distribution_id: str, paths: List[str]) -> str:
+    """
+    Create a CloudFront invalidation.
 
-    except Exception as e:
-        logger.error(f"Build and sync failed with error: {str(e)}")
-        return False
+    Args:
+        distribution_id: CloudFront distribution ID
+        paths: Paths to invalidate (compressed before submission)
+
+    Returns:
+        str: The invalidation ID
+    """
+    paths = _compress_paths(paths)
+    logger.info(f"Creating CloudFront invalidation for distribution: {distribution_id}")
+    logger.info(f"Paths to invalidate: {paths}")
+
+    response = _client("cloudfront").create_invalidation(
+        DistributionId=distribution_id,
+        InvalidationBatch={
+            "Paths": {"Quantity": len(paths), "Items": paths},
+            "CallerReference": f"cfngin-{time.time_ns()}-{uuid.uuid4().hex[:8]}",
+        },
+    )
+
+    invalidation_id = response["Invalidation"]["Id"]
+    logger.info(f"Invalidation created with ID: {invalidation_id}")
+    return invalidation_id
+
+
+def _wait_for_invalidation(
+    cloudfront: Any, distribution_id: str, invalidation_id: str
+) -> bool:
+    """
+    Poll an invalidation with exponential backoff until it completes.
+
+    Args:
+        cloudfront: boto3 CloudFront client
+        distribution_id: CloudFront distribution ID
+        invalidation_id: Invalidation ID to wait for
+
+    Returns:
+        bool: True if the invalidation completed, False on timeout
+    """
+    delay = INVALIDATION_POLL_INITIAL_DELAY
+    deadline = time.monotonic() + INVALIDATION_WAIT_TIMEOUT
+
+    while True:
+        response = cloudfront.get_invalidation(
+            DistributionId=distribution_id, Id=invalidation_id
+        )
+        if response["Invalidation"]["Status"] == "Completed":
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, INVALIDATION_POLL_MAX_DELAY)
 
 
 class CloudFrontInvalidation:
@@ -235,37 +729,18 @@ class CloudFrontInvalidation:
                 logger.error("distribution_id parameter is required")
                 return False
 
-            logger.info(
-                f"Creating CloudFront invalidation for distribution: {distribution_id}"
-            )
-            logger.info(f"Paths to invalidate: {paths}")
-
-            # Create CloudFront client
-            cloudfront = boto3.client("cloudfront")
-
-            # Create invalidation
-            response = cloudfront.create_invalidation(
-                DistributionId=distribution_id,
-                InvalidationBatch={
-                    "Paths": {"Quantity": len(paths), "Items": paths},
-                    "CallerReference": f"cfngin-{int(time.time())}",
-                },
-            )
-
-            invalidation_id = response["Invalidation"]["Id"]
-            logger.info(f"Invalidation created with ID: {invalidation_id}")
+            invalidation_id = _create_invalidation(distribution_id, paths)
 
             if wait:
                 logger.info("Waiting for invalidation to complete...")
-                waiter = cloudfront.get_waiter("invalidation_completed")
-                waiter.wait(
-                    DistributionId=distribution_id,
-                    Id=invalidation_id,
-                    WaiterConfig={
-                        "Delay": 30,
-                        "MaxAttempts": 40,  # Wait up to 20 minutes
-                    },
-                )
+                if not _wait_for_invalidation(
+                    _client("cloudfront"), distribution_id, invalidation_id
+                ):
+                    logger.error(
+                        f"Invalidation did not complete within "
+                        f"{INVALIDATION_WAIT_TIMEOUT} seconds"
+                    )
+                    return False
                 logger.info("Invalidation completed successfully")
             else:
                 logger.info("Invalidation started (not waiting for completion)")
@@ -298,9 +773,28 @@ if __name__ == "__main__":
     parser.add_argument("--bucket-name", required=True, help="S3 bucket name")
     parser.add_argument("--app-path", default="./app", help="Path to app directory")
     parser.add_argument("--environment", default="dev", help="Environment (dev/prod)")
+    parser.add_argument(
+        "--accelerate",
+        nargs="?",
+        const=True,
+        default=False,
+        type=_parse_accelerate,
+        help="Use S3 Transfer Acceleration (pass 'auto' to detect from the bucket)",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="Gzip text assets before upload"
+    )
+    parser.add_argument(
+        "--distribution-id", help="CloudFront distribution to invalidate after sync"
+    )
 
     args = parser.parse_args()
 
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
     # Mock context and provider for testing
     mock_context = {}
     mock_provider = None
@@ -311,6 +805,9 @@ if __name__ == "__main__":
         bucket_name=args.bucket_name,
         app_path=args.app_path,
         environment=args.environment,
+        accelerate=args.accelerate,
+        compress=args.compress,
+        distribution_id=args.distribution_id,
     )
 
     sys.exit(0 if success else 1)
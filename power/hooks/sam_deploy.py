@@ -23,6 +23,7 @@ Usage as CFNgin Hook:
             - CAPABILITY_IAM
           wait: true
           skip_build: false  # Set to true to skip sam build step
+          skip_failed_stack_check: false  # Set to true for stacks known to be healthy
 
 Usage as CLI:
     python hooks/sam_deploy.py --template template.yaml --stack-name my-stack --env dev
@@ -31,20 +32,27 @@ Usage as CLI:
 """
 
 import argparse
+import collections
+import functools
 import json
 import logging
 import os
+import re
+import select
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Configure logging
 logging.basicConfig(
@@ -54,27 +62,462 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Default seconds between CloudFormation waiter polls (SAM_POLL_DELAY);
+# short stacks finish between polls, so a small delay saves most of a poll
+# interval per wait
+DEFAULT_POLL_DELAY = 5
+
+# Wait budget when deleting a failed stack before redeploying
+FAILED_STACK_DELETE_TIMEOUT = 1800
+
+# Seconds to wait for an answer before declining to delete a failed stack
+CONFIRM_TIMEOUT = 300
+
+# Seconds a describe_stacks result is reused by later checks of the stack
+DESCRIBE_CACHE_TTL = 10
+
+# Characters that force a parameter override value to be quoted
+_OVERRIDE_UNSAFE_RE = re.compile(r'[\s"\']')
+
+# Seconds an account-wide describe_stacks result serves CFNgin hook calls
+BATCH_DESCRIBE_WINDOW = 5
+
+# Lines of streamed SAM CLI output kept for results and the no-changes check
+STREAM_TAIL_LINES = 500
+
+# Line sam deploy prints when the changeset is empty, e.g.
+# "No changes to deploy. Stack my-stack is up to date"
+_NO_CHANGES_RE = re.compile(r'No changes to deploy.*is up to date')
+
+# Rows of the Outputs table printed by sam deploy, e.g. "Key    ApiUrl"
+_SAM_OUTPUT_ROW_RE = re.compile(r'^(Key|Description|Value)\s+(.*?)\s*$')
+
+# Stack-level rows of the CloudFormation events table printed by sam deploy
+_SAM_STACK_EVENT_RE = re.compile(
+    r'^\s*((?:CREATE|UPDATE)_COMPLETE)\s+AWS::CloudFormation::Stack\s+(\S+)', re.M
+)
+
+# (stack_name, region) -> (stack description or None, time.monotonic() expiry)
+_DESCRIBE_CACHE: Dict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], float]] = {}
+
+
 class SAMDeployError(Exception):
     """Custom exception for SAM deployment errors."""
     pass
 
 
+class _BatchStackCache:
+    """
+    Stack descriptions shared by CFNgin hook calls for sibling stacks.
+    
+    The first lookup in a region issues one describe_stacks call without a
+    StackName and keeps the returned page for BATCH_DESCRIBE_WINDOW seconds,
+    so hooks fired for many stacks at once cost one API call instead of one
+    each. Callers fall back to a per-stack describe for names missing from
+    the page (deleted stacks, or stacks past the first page).
+    """
+    
+    def __init__(self, window: float = BATCH_DESCRIBE_WINDOW):
+        """Initialize an empty cache."""
+        self.window = window
+        self._lock = threading.Lock()
+        self._batches: Dict[str, Tuple[Dict[str, Dict[str, Any]], float]] = {}
+    
+    def get(self, cf_client: Any, stack_name: str, region: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a stack description from the current batch for a region.
+        
+        Args:
+            cf_client: CloudFormation client for the region
+            stack_name: CloudFormation stack name
+            region: AWS region
+            
+        Returns:
+            Stack description, or None if the stack is not in the batch
+        """
+        # Held across the API call so concurrent hooks wait for one batch
+        with self._lock:
+            batch = self._batches.get(region)
+            if batch is None or batch[1] <= time.monotonic():
+                response = cf_client.describe_stacks()
+                stacks = {stack['StackName']: stack for stack in response.get('Stacks', [])}
+                batch = (stacks, time.monotonic() + self.window)
+                self._batches[region] = batch
+            return batch[0].get(stack_name)
+    
+    def forget(self, stack_name: str, region: str) -> None:
+        """Drop a stack that is being changed from the current batch."""
+        with self._lock:
+            batch = self._batches.get(region)
+            if batch is not None:
+                batch[0].pop(stack_name, None)
+    
+    def clear(self) -> None:
+        """Drop all batches."""
+        with self._lock:
+            self._batches.clear()
+
+
+_BATCH_STACK_CACHE = _BatchStackCache()
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_env_loaded() -> None:
+    """Load .env into the environment once, on the first hook or CLI call."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=1)
+def _cloudformation_config() -> Any:
+    """
+    CloudFormation client settings: room for concurrent hooks in one pool,
+    kept-alive connections and adaptive retries that back off on throttling.
+    """
+    from botocore.config import Config
+    return Config(
+        max_pool_connections=50,
+        retries={'max_attempts': 10, 'mode': 'adaptive'},
+        tcp_keepalive=True
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(region: str) -> Any:
+    """
+    Get the process-wide CloudFormation client for a region.
+    
+    Clients come from boto3's default session and are shared by every
+    SAMDeployHook, so hook calls reuse open connections instead of
+    repeating TLS handshakes. boto3 is imported here rather than at module
+    load, so the CLI and code paths without AWS calls start quickly.
+    
+    Args:
+        region: AWS region
+        
+    Returns:
+        CloudFormation client
+    """
+    import boto3
+    return boto3.client('cloudformation', region_name=region, config=_cloudformation_config())
+
+
+def _waiter_config(timeout: int) -> Dict[str, int]:
+    """WaiterConfig that polls every SAM_POLL_DELAY seconds for up to timeout seconds."""
+    delay = int(os.getenv('SAM_POLL_DELAY', DEFAULT_POLL_DELAY))
+    return {'Delay': delay, 'MaxAttempts': max(1, timeout // delay)}
+
+
+@functools.lru_cache(maxsize=1)
+def _sam_cli_version() -> str:
+    """
+    Get the SAM CLI version, running ``sam --version`` once per process.
+    
+    Failures raise and are therefore not cached, so a later call probes again.
+    
+    Returns:
+        Version string printed by the SAM CLI
+        
+    Raises:
+        SAMDeployError: If the SAM CLI is missing, fails or times out
+    """
+    try:
+        result = subprocess.run(
+            ['sam', '--version'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        raise SAMDeployError(f"SAM CLI not found or timeout: {e}")
+    
+    if result.returncode != 0:
+        raise SAMDeployError(f"SAM CLI check failed: {result.stderr}")
+    
+    version = result.stdout.strip()
+    logger.info(f"SAM CLI version: {version}")
+    return version
+
+
+def _quote_override(value: Any) -> str:
+    """
+    Quote a parameter override value for the SAM CLI.
+    
+    SAM splits overrides on spaces and only understands double quotes, so
+    shlex.quote's single quotes would end up in the value. SAM unescapes
+    only \\" inside quotes, so backslashes are passed through as they are.
+    
+    Args:
+        value: Parameter value
+        
+    Returns:
+        The value, double-quoted and escaped if it needs to be
+    """
+    text = str(value)
+    if text and not _OVERRIDE_UNSAFE_RE.search(text):
+        return text
+    return '"' + text.replace('"', '\\"') + '"'
+
+
+def _read_bytes_if_exists(path: Path) -> Optional[bytes]:
+    """Read a file in one open, returning None if it does not exist."""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _parse_sam_outputs(stdout: str) -> Dict[str, str]:
+    """
+    Parse the stack outputs table that sam deploy prints after deploying.
+    
+    Args:
+        stdout: Output of sam deploy
+        
+    Returns:
+        Dictionary of output keys to values; empty if there is no table or a
+        value wraps onto several lines, so callers fall back to describe_stacks
+    """
+    lines = stdout.splitlines()
+    try:
+        start = next(i for i, line in enumerate(lines) if line.strip() == 'Outputs')
+    except StopIteration:
+        return {}
+    
+    outputs: Dict[str, str] = {}
+    key = None
+    field = None
+    # Skip the rule under the table title
+    for line in lines[start + 2:]:
+        if line.startswith('---'):
+            break
+        match = _SAM_OUTPUT_ROW_RE.match(line)
+        if match:
+            field = match.group(1)
+            if field == 'Key':
+                key = match.group(2)
+            elif field == 'Value' and key:
+                outputs[key] = match.group(2)
+        elif line.strip():
+            if field == 'Value':
+                # Wrapped values cannot be rejoined reliably
+                return {}
+        else:
+            field = None
+    return outputs
+
+
+def _confirm(question: str, timeout: float = CONFIRM_TIMEOUT) -> bool:
+    """
+    Ask a yes/no question on the terminal.
+    
+    Without a terminal on stdin, or without an answer within timeout
+    seconds, the answer is no, so an unattended run fails instead of hanging.
+    On Windows select() only works on sockets, so the prompt waits for an
+    answer without a timeout there.
+    
+    Args:
+        question: Question to print before the (y/n) hint
+        timeout: Seconds to wait for an answer
+        
+    Returns:
+        True if the user answered yes
+    """
+    if not sys.stdin.isatty():
+        logger.warning("stdin is not a terminal - cannot ask for confirmation")
+        return False
+    
+    deadline = time.monotonic() + timeout
+    while True:
+        print(f"{question} (y/n): ", end='', flush=True)
+        if os.name != 'nt':
+            readable, _, _ = select.select([sys.stdin], [], [], max(0.0, deadline - time.monotonic()))
+            if not readable:
+                print()
+                logger.warning(f"No answer within {timeout} seconds")
+                return False
+        
+        line = sys.stdin.readline()
+        if not line:
+            return False
+        response = line.lower().strip()
+        if response in ['y', 'yes']:
+            return True
+        elif response in ['n', 'no']:
+            return False
+        else:
+            print("Please enter 'y' for yes or 'n' for no.")
+
+
+@functools.lru_cache(maxsize=32)
+def _sam_deploy_command(
+    template_file: str,
+    stack_name: str,
+    config_file: Optional[str],
+    env: Optional[str],
+    parameters: Tuple[Tuple[str, str], ...],
+    capabilities: Tuple[str, ...],
+    region: str,
+    guided: bool,
+    confirm_changeset: bool,
+    resolve_s3: bool,
+    resolve_image_repos: bool
+) -> Tuple[str, ...]:
+    """
+    Build the SAM deploy command from hashable arguments.
+    
+    Retried hooks and multi-environment deploys of the same template ask for
+    the same command, so it is built once and returned as a tuple.
+    
+    Args:
+        template_file: Path to SAM template file
+        stack_name: CloudFormation stack name
+        config_file: Existing SAM config file, or None
+        env: SAM config environment
+        parameters: Parameter overrides as (key, value) pairs
+        capabilities: CloudFormation capabilities; empty for the defaults
+        region: AWS region
+        guided: Whether to run a guided deploy
+        confirm_changeset: Whether to prompt before executing the changeset
+        resolve_s3: Whether to let SAM create the artifact bucket
+        resolve_image_repos: Whether to let SAM create ECR repositories
+        
+    Returns:
+        The sam deploy command
+    """
+    cmd = [
+        'sam', 'deploy',
+        '--template-file', template_file,
+        '--stack-name', stack_name,
+        '--region', region
+    ]
+    
+    # Add config file if specified
+    if config_file:
+        cmd.extend(['--config-file', config_file])
+    
+    # Add environment if specified
+    if env:
+        cmd.extend(['--config-env', env])
+    
+    # Add parameters as one space-separated argument
+    if parameters:
+        cmd.extend(['--parameter-overrides', ' '.join(
+            f"{key}={_quote_override(value)}" for key, value in parameters
+        )])
+    
+    # Add capabilities
+    if capabilities:
+        cmd.extend(['--capabilities', *capabilities])
+    else:
+        # Default capabilities for most SAM applications
+        cmd.extend(['--capabilities', 'CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM'])
+    
+    # Add other options
+    if guided:
+        cmd.append('--guided')
+    
+    if not confirm_changeset:
+        cmd.append('--no-confirm-changeset')
+    
+    if resolve_s3:
+        cmd.append('--resolve-s3')
+        
+    if resolve_image_repos:
+        cmd.append('--resolve-image-repos')
+    
+    return tuple(cmd)
+
+
 class SAMDeployHook:
     """Hook for deploying AWS SAM templates."""
     
-    def __init__(self):
-        """Initialize the SAM deploy hook."""
+    def __init__(self, batch_describe: bool = False):
+        """
+        Initialize the SAM deploy hook.
+        
+        Args:
+            batch_describe: Look stacks up through the account-wide batch shared
+                by concurrent CFNgin hook calls (default: False)
+        """
         self.cloudformation = None
+        self.batch_describe = batch_describe
         
-    def _get_cloudformation_client(self, region: str = 'us-east-1') -> boto3.client:
+    def _get_cloudformation_client(self, region: str = 'us-east-1') -> Any:
         """Get CloudFormation client."""
+        from botocore.exceptions import NoCredentialsError
+        
         if not self.cloudformation:
             try:
-                self.cloudformation = boto3.client('cloudformation', region_name=region)
+                self.cloudformation = _get_client(region)
             except NoCredentialsError as e:
                 raise SAMDeployError(f"AWS credentials not configured: {e}")
         return self.cloudformation
     
+    def _describe_stack(self, stack_name: str, region: str = 'us-east-1',
+                        use_batch: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Describe a stack, reusing a description from the last DESCRIBE_CACHE_TTL seconds.
+        
+        Args:
+            stack_name: CloudFormation stack name
+            region: AWS region
+            use_batch: Allow the account-wide batch lookup when batch_describe is
+                enabled; single-stack reads after a deploy pass False
+            
+        Returns:
+            Stack description, or None if the stack does not exist
+            
+        Raises:
+            ClientError: If the stack cannot be described for another reason
+        """
+        key = (stack_name, region)
+        cached = _DESCRIBE_CACHE.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        from botocore.exceptions import ClientError
+        
+        cf_client = self._get_cloudformation_client(region)
+        stack = None
+        if self.batch_describe and use_batch:
+            try:
+                stack = _BATCH_STACK_CACHE.get(cf_client, stack_name, region)
+            except ClientError as e:
+                logger.debug(f"Batch stack lookup failed, describing {stack_name} directly: {e}")
+        
+        if stack is None:
+            try:
+                response = cf_client.describe_stacks(StackName=stack_name)
+                stack = response['Stacks'][0] if response['Stacks'] else None
+            except ClientError as e:
+                error_code = e.response.get('Error', {}).get('Code', '')
+                if error_code != 'ValidationError' or 'does not exist' not in str(e):
+                    raise
+        
+        _DESCRIBE_CACHE[key] = (stack, time.monotonic() + DESCRIBE_CACHE_TTL)
+        return stack
+    
+    def _stack_status(self, stack_name: str, region: str = 'us-east-1') -> Optional[str]:
+        """
+        Return the status of a stack, or None if it does not exist.
+        
+        Args:
+            stack_name: CloudFormation stack name
+            region: AWS region
+            
+        Returns:
+            Stack status such as 'UPDATE_COMPLETE', or None if the stack does not exist
+        """
+        stack = self._describe_stack(stack_name, region)
+        return stack.get('StackStatus', '') if stack is not None else None
+    
+    @staticmethod
+    def _forget_stack(stack_name: str, region: str = 'us-east-1') -> None:
+        """Drop the cached description of a stack that is being changed."""
+        _DESCRIBE_CACHE.pop((stack_name, region), None)
+        _BATCH_STACK_CACHE.forget(stack_name, region)
+    
     def _check_and_handle_failed_stack(self, stack_name: str, region: str = 'us-east-1') -> bool:
         """
         Check if stack is in a failed state and delete it if necessary.
@@ -86,16 +529,15 @@ class SAMDeployHook:
         Returns:
             True if stack was deleted or doesn't exist, False if stack exists and is healthy
         """
+        from botocore.exceptions import ClientError
+        
         cf_client = self._get_cloudformation_client(region)
         
         try:
-            response = cf_client.describe_stacks(StackName=stack_name)
-            if not response['Stacks']:
+            stack_status = self._stack_status(stack_name, region)
+            if stack_status is None:
                 logger.info(f"Stack {stack_name} does not exist")
                 return True
-                
-            stack = response['Stacks'][0]
-            stack_status = stack.get('StackStatus', '')
             
             # Define failed states that require deletion
             failed_states = {
@@ -119,26 +561,17 @@ class SAMDeployHook:
                     # Ask user for confirmation
                     print(f"\n⚠️  Stack '{stack_name}' is in failed state: {stack_status}")
                     print("This stack needs to be deleted before redeployment can proceed.")
-                    
-                    while True:
-                        response = input("Do you want to delete this stack and continue? (y/n): ").lower().strip()
-                        if response in ['y', 'yes']:
-                            should_delete = True
-                            break
-                        elif response in ['n', 'no']:
-                            should_delete = False
-                            break
-                        else:
-                            print("Please enter 'y' for yes or 'n' for no.")
+                    should_delete = _confirm("Do you want to delete this stack and continue?")
                 
                 if not should_delete:
-                    logger.info("User chose not to delete the failed stack. Deployment aborted.")
-                    raise SAMDeployError(f"Stack {stack_name} is in failed state {stack_status} and user declined deletion")
+                    logger.info("Deletion of the failed stack was not confirmed. Deployment aborted.")
+                    raise SAMDeployError(f"Stack {stack_name} is in failed state {stack_status} and deletion was not confirmed")
                 
                 logger.info(f"Deleting failed stack {stack_name} before redeployment")
                 
                 # Delete the failed stack
                 cf_client.delete_stack(StackName=stack_name)
+                self._forget_stack(stack_name, region)
                 
                 # Wait for deletion to complete
                 logger.info(f"Waiting for stack {stack_name} deletion to complete...")
@@ -147,10 +580,7 @@ class SAMDeployHook:
                 try:
                     waiter.wait(
                         StackName=stack_name,
-                        WaiterConfig={
-                            'Delay': 30,
-                            'MaxAttempts': 60  # 30 minutes max
-                        }
+                        WaiterConfig=_waiter_config(FAILED_STACK_DELETE_TIMEOUT)
                     )
                     logger.info(f"Stack {stack_name} deleted successfully")
                     return True
@@ -164,14 +594,8 @@ class SAMDeployHook:
                 return False
                 
         except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', '')
-            
-            if error_code == 'ValidationError' and 'does not exist' in str(e):
-                logger.info(f"Stack {stack_name} does not exist")
-                return True
-            else:
-                logger.error(f"Error checking stack status: {e}")
-                raise SAMDeployError(f"Failed to check stack status: {e}")
+            logger.error(f"Error checking stack status: {e}")
+            raise SAMDeployError(f"Failed to check stack status: {e}")
         
         except Exception as e:
             logger.error(f"Unexpected error checking stack status: {e}")
@@ -198,68 +622,51 @@ class SAMDeployHook:
         Returns:
             Dictionary with deletion results
         """
+        from botocore.exceptions import ClientError
+        
         logger.info(f"Starting stack deletion for: {stack_name}")
         
         cf_client = self._get_cloudformation_client(region)
         
         try:
             # Check if stack exists first
-            try:
-                response = cf_client.describe_stacks(StackName=stack_name)
-                if not response['Stacks']:
-                    logger.info(f"Stack {stack_name} does not exist")
-                    return {
-                        'success': True,
-                        'stack_name': stack_name,
-                        'region': region,
-                        'message': 'Stack does not exist'
-                    }
-                
-                stack = response['Stacks'][0]
-                current_status = stack.get('StackStatus', '')
-                
-                # Check if stack is already being deleted
-                if current_status in ['DELETE_IN_PROGRESS']:
-                    logger.info(f"Stack {stack_name} is already being deleted")
-                    if wait:
-                        logger.info(f"Waiting for existing deletion to complete...")
-                        waiter = cf_client.get_waiter('stack_delete_complete')
-                        waiter.wait(
-                            StackName=stack_name,
-                            WaiterConfig={
-                                'Delay': 30,
-                                'MaxAttempts': timeout // 30
-                            }
-                        )
-                    return {
-                        'success': True,
-                        'stack_name': stack_name,
-                        'region': region,
-                        'message': 'Stack deletion already in progress'
-                    }
-                
-                # Check if stack is in a state that can't be deleted
-                if current_status in ['DELETE_COMPLETE']:
-                    logger.info(f"Stack {stack_name} is already deleted")
-                    return {
-                        'success': True,
-                        'stack_name': stack_name,
-                        'region': region,
-                        'message': 'Stack already deleted'
-                    }
-                
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', '')
-                if error_code == 'ValidationError' and 'does not exist' in str(e):
-                    logger.info(f"Stack {stack_name} does not exist")
-                    return {
-                        'success': True,
-                        'stack_name': stack_name,
-                        'region': region,
-                        'message': 'Stack does not exist'
-                    }
-                else:
-                    raise
+            current_status = self._stack_status(stack_name, region)
+            if current_status is None:
+                logger.info(f"Stack {stack_name} does not exist")
+                return {
+                    'success': True,
+                    'stack_name': stack_name,
+                    'region': region,
+                    'message': 'Stack does not exist'
+                }
+            
+            # Check if stack is already being deleted
+            if current_status in ['DELETE_IN_PROGRESS']:
+                logger.info(f"Stack {stack_name} is already being deleted")
+                if wait:
+                    logger.info(f"Waiting for existing deletion to complete...")
+                    waiter = cf_client.get_waiter('stack_delete_complete')
+                    waiter.wait(
+                        StackName=stack_name,
+                        WaiterConfig=_waiter_config(timeout)
+                    )
+                    self._forget_stack(stack_name, region)
+                return {
+                    'success': True,
+                    'stack_name': stack_name,
+                    'region': region,
+                    'message': 'Stack deletion already in progress'
+                }
+            
+            # Check if stack is in a state that can't be deleted
+            if current_status in ['DELETE_COMPLETE']:
+                logger.info(f"Stack {stack_name} is already deleted")
+                return {
+                    'success': True,
+                    'stack_name': stack_name,
+                    'region': region,
+                    'message': 'Stack already deleted'
+                }
             
             # Prepare delete parameters
             delete_params = {'StackName': stack_name}
@@ -270,6 +677,7 @@ class SAMDeployHook:
             # Delete the stack
             logger.info(f"Deleting stack {stack_name}...")
             cf_client.delete_stack(**delete_params)
+            self._forget_stack(stack_name, region)
             
             # Wait for deletion if requested
             if wait:
@@ -279,10 +687,7 @@ class SAMDeployHook:
                 try:
                     waiter.wait(
                         StackName=stack_name,
-                        WaiterConfig={
-                            'Delay': 30,
-                            'MaxAttempts': timeout // 30
-                        }
+                        WaiterConfig=_waiter_config(timeout)
                     )
                     logger.info(f"Stack {stack_name} deleted successfully")
                     
@@ -310,22 +715,92 @@ class SAMDeployHook:
     def _check_sam_cli(self) -> bool:
         """Check if SAM CLI is installed and available."""
         try:
-            result = subprocess.run(
-                ['sam', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                logger.info(f"SAM CLI version: {result.stdout.strip()}")
-                return True
-            else:
-                logger.error(f"SAM CLI check failed: {result.stderr}")
-                return False
-        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            logger.error(f"SAM CLI not found or timeout: {e}")
+            _sam_cli_version()
+            return True
+        except SAMDeployError as e:
+            logger.error(str(e))
             return False
     
+    def _run_streamed(self, cmd: List[str], timeout: int,
+                      cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+        """
+        Run a SAM CLI command, logging merged stdout/stderr lines as they arrive.
+        
+        Only the last STREAM_TAIL_LINES lines are kept; they are returned as
+        stdout and, if the command fails, also as stderr.
+        
+        Args:
+            cmd: Command to run
+            timeout: Timeout in seconds
+            cwd: Directory to run the command in (None for the current one)
+            
+        Returns:
+            CompletedProcess with the output tail
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command does not finish in time
+        """
+        tail: Deque[str] = collections.deque(maxlen=STREAM_TAIL_LINES)
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            cwd=cwd
+        ) as process:
+            # Reading blocks, so enforce the timeout by killing the process
+            timed_out = threading.Event()
+            
+            def kill() -> None:
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    line = line.rstrip()
+                    logger.info(line)
+                    tail.append(line)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        
+        output = '\n'.join(tail)
+        return subprocess.CompletedProcess(cmd, returncode, output, output if returncode else '')
+    
+    def _run_sam_build(self, template_file: str, timeout: int,
+                       working_directory: Optional[str] = None) -> None:
+        """
+        Run ``sam build`` for the template.
+        
+        Args:
+            template_file: Path to SAM template file
+            timeout: Timeout in seconds
+            working_directory: Directory to run the build from
+            
+        Raises:
+            SAMDeployError: If the build fails
+            subprocess.TimeoutExpired: If the build does not finish in time
+        """
+        build_cmd = ['sam', 'build', '--template-file', template_file]
+        logger.info(f"Building SAM application: {' '.join(build_cmd)}")
+        
+        build_result = self._run_streamed(build_cmd, timeout, working_directory)
+        
+        if build_result.returncode != 0:
+            error_msg = f"SAM build failed with return code {build_result.returncode}"
+            if build_result.stderr:
+                error_msg += f": {build_result.stderr}"
+            logger.error(error_msg)
+            raise SAMDeployError(error_msg)
+        
+        logger.info("SAM build completed successfully")
+    
     def _build_sam_command(
         self,
         template_file: str,
@@ -341,50 +816,21 @@ class SAMDeployHook:
         resolve_image_repos: bool = True
     ) -> List[str]:
         """Build the SAM deploy command."""
-        cmd = [
-            'sam', 'deploy',
-            '--template-file', template_file,
-            '--stack-name', stack_name,
-            '--region', region
-        ]
-        
-        # Add config file if specified
-        if config_file and os.path.exists(config_file):
-            cmd.extend(['--config-file', config_file])
-        
-        # Add environment if specified
-        if env:
-            cmd.extend(['--config-env', env])
-        
-        # Add parameters
-        if parameters:
-            param_overrides = []
-            for key, value in parameters.items():
-                param_overrides.append(f"{key}={value}")
-            if param_overrides:
-                cmd.extend(['--parameter-overrides'] + param_overrides)
-        
-        # Add capabilities
-        if capabilities:
-            cmd.extend(['--capabilities'] + capabilities)
-        else:
-            # Default capabilities for most SAM applications
-            cmd.extend(['--capabilities', 'CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM'])
-        
-        # Add other options
-        if guided:
-            cmd.append('--guided')
-        
-        if not confirm_changeset:
-            cmd.append('--no-confirm-changeset')
-        
-        if resolve_s3:
-            cmd.append('--resolve-s3')
-            
-        if resolve_image_repos:
-            cmd.append('--resolve-image-repos')
-        
-        return cmd
+        # The config file check touches the filesystem, so it stays outside
+        # the cache; everything else is reduced to hashable arguments
+        return list(_sam_deploy_command(
+            template_file,
+            stack_name,
+            config_file if config_file and os.path.exists(config_file) else None,
+            env,
+            tuple((key, str(value)) for key, value in parameters.items()) if parameters else (),
+            tuple(capabilities) if capabilities else (),
+            region,
+            guided,
+            confirm_changeset,
+            resolve_s3,
+            resolve_image_repos
+        ))
     
     def deploy_sam_template(
         self,
@@ -400,7 +846,8 @@ class SAMDeployHook:
         timeout: int = 1800,
         working_directory: Optional[str] = None,
         skip_build: bool = False,
-        resolve_image_repos: bool = True
+        resolve_image_repos: bool = True,
+        skip_failed_stack_check: bool = False
     ) -> Dict[str, Any]:
         """
         Deploy SAM template.
@@ -418,9 +865,13 @@ class SAMDeployHook:
             timeout: Timeout in seconds
             working_directory: Directory to run SAM command from
             skip_build: Skip the sam build step (default: False)
+            skip_failed_stack_check: Skip the pre-deploy failed-stack check (default: False)
             
         Returns:
-            Dictionary with deployment results
+            Dictionary with deployment results. When waiting, stack_info has
+            StackName, StackStatus and Outputs; StackId is included only when
+            the stack had to be described, not when sam deploy printed the
+            outputs itself
         """
         logger.info(f"Starting SAM deployment for stack: {stack_name}")
         
@@ -431,23 +882,25 @@ class SAMDeployHook:
             if working_directory:
                 param_file_path = Path(working_directory) / param_file_path
             
-            if param_file_path.exists():
-                try:
-                    with open(param_file_path, 'r') as f:
-                        file_parameters = json.load(f)
-                    
-                    if not isinstance(file_parameters, dict):
-                        raise SAMDeployError(f"Parameter file {param_file_path} must contain a JSON object with key-value pairs")
-                    
-                    final_parameters.update(file_parameters)
-                    logger.info(f"Loaded {len(file_parameters)} parameters from {param_file_path}")
-                    
-                except json.JSONDecodeError as e:
-                    raise SAMDeployError(f"Invalid JSON in parameter file {param_file_path}: {e}")
-                except Exception as e:
-                    raise SAMDeployError(f"Error reading parameter file {param_file_path}: {e}")
-            else:
-                raise SAMDeployError(f"Parameter file not found: {param_file_path}")
+            try:
+                content = _read_bytes_if_exists(param_file_path)
+                if content is None:
+                    raise SAMDeployError(f"Parameter file not found: {param_file_path}")
+                
+                file_parameters = _json_loads(content)
+                
+                if not isinstance(file_parameters, dict):
+                    raise SAMDeployError(f"Parameter file {param_file_path} must contain a JSON object with key-value pairs")
+                
+                final_parameters.update(file_parameters)
+                logger.info(f"Loaded {len(file_parameters)} parameters from {param_file_path}")
+                
+            except SAMDeployError:
+                raise
+            except json.JSONDecodeError as e:
+                raise SAMDeployError(f"Invalid JSON in parameter file {param_file_path}: {e}")
+            except Exception as e:
+                raise SAMDeployError(f"Error reading parameter file {param_file_path}: {e}")
         
         # Merge with inline parameters (inline parameters take precedence)
         if parameters:
@@ -461,10 +914,6 @@ class SAMDeployHook:
         if not self._check_sam_cli():
             raise SAMDeployError("SAM CLI is not installed or not available in PATH")
         
-        # Check for failed stack states and delete if necessary
-        logger.info(f"Checking stack {stack_name} for failed states...")
-        self._check_and_handle_failed_stack(stack_name, region)
-        
         # Validate template file exists
         template_path = Path(template_file)
         if working_directory:
@@ -488,90 +937,89 @@ class SAMDeployHook:
         logger.info(f"Executing SAM command: {' '.join(cmd)}")
         
         try:
-            # Change to working directory if specified
-            original_cwd = None
-            if working_directory:
-                original_cwd = os.getcwd()
-                os.chdir(working_directory)
-                logger.info(f"Changed working directory to: {working_directory}")
-            
-            # Execute SAM build command first (unless skipped)
-            if not skip_build:
-                build_cmd = ['sam', 'build', '--template-file', template_file]
-                logger.info(f"Building SAM application: {' '.join(build_cmd)}")
-                
-                build_result = subprocess.run(
-                    build_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout // 2  # Use half the timeout for build
-                )
-                
-                if build_result.returncode != 0:
-                    error_msg = f"SAM build failed with return code {build_result.returncode}"
-                    if build_result.stderr:
-                        error_msg += f": {build_result.stderr}"
-                    logger.error(error_msg)
-                    logger.error(f"Build command output: {build_result.stdout}")
-                    raise SAMDeployError(error_msg)
-                
-                logger.info("SAM build completed successfully")
-                logger.debug(f"Build command output: {build_result.stdout}")
-            else:
+            # Check for failed stack states and delete if necessary, then
+            # build (unless skipped)
+            if skip_failed_stack_check:
+                logger.info(f"Skipping failed-state check for stack {stack_name}")
+                if skip_build:
+                    logger.info("Skipping SAM build step")
+                else:
+                    self._run_sam_build(template_file, timeout // 2, working_directory)
+            elif skip_build:
+                logger.info(f"Checking stack {stack_name} for failed states...")
                 logger.info("Skipping SAM build step")
+                self._check_and_handle_failed_stack(stack_name, region)
+            elif os.getenv('CI') is None:
+                logger.info(f"Checking stack {stack_name} for failed states...")
+                # The check may prompt; keep the prompt clear of build output
+                self._check_and_handle_failed_stack(stack_name, region)
+                self._run_sam_build(template_file, timeout // 2, working_directory)
+            else:
+                logger.info(f"Checking stack {stack_name} for failed states...")
+                # The CloudFormation check and the local build are independent
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    check = executor.submit(self._check_and_handle_failed_stack, stack_name, region)
+                    build = executor.submit(
+                        self._run_sam_build, template_file, timeout // 2, working_directory
+                    )
+                    check.result()
+                    build.result()
             
             # Execute SAM deploy command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            # Restore original working directory
-            if original_cwd:
-                os.chdir(original_cwd)
+            result = self._run_streamed(cmd, timeout, working_directory)
             
             # Handle SAM CLI return codes
-            # SAM CLI returns exit code 1 when there are no changes to deploy, but this should be treated as success
-            if result.returncode != 0:
-                # Check if this is a "no changes to deploy" case, which should be treated as success
-                output_text = result.stdout + (result.stderr or "")
-                if "No changes to deploy" in output_text and "is up to date" in output_text:
-                    logger.info("SAM deployment completed - no changes to deploy (stack is up to date)")
-                    logger.info(f"Command output: {result.stdout}")
-                else:
-                    error_msg = f"SAM deploy failed with return code {result.returncode}"
-                    if result.stderr:
-                        error_msg += f": {result.stderr}"
-                    logger.error(error_msg)
-                    logger.error(f"Command output: {result.stdout}")
-                    raise SAMDeployError(error_msg)
+            # SAM CLI returns exit code 1 when there are no changes to deploy, but this should be treated as success.
+            # stderr is merged into stdout, so stdout alone holds the whole tail
+            no_changes = _NO_CHANGES_RE.search(result.stdout) is not None
+            if result.returncode != 0 and not no_changes:
+                error_msg = f"SAM deploy failed with return code {result.returncode}"
+                if result.stderr:
+                    error_msg += f": {result.stderr}"
+                logger.error(error_msg)
+                self._forget_stack(stack_name, region)
+                raise SAMDeployError(error_msg)
             
             # Log success message based on whether changes were deployed
-            output_text = result.stdout + (result.stderr or "")
-            if "No changes to deploy" in output_text and "is up to date" in output_text:
+            if no_changes:
                 logger.info("SAM deployment completed - no changes to deploy (stack is up to date)")
             else:
                 logger.info("SAM deployment completed successfully")
-            logger.info(f"Command output: {result.stdout}")
+                # The stack changed, so its outputs must be described afresh;
+                # an unchanged stack reuses the pre-deploy description
+                self._forget_stack(stack_name, region)
             
             # Get stack information if wait is enabled
             stack_info = {}
-            if wait:
+            outputs = _parse_sam_outputs(result.stdout) if wait else {}
+            stack_status = None
+            if outputs:
+                for event in _SAM_STACK_EVENT_RE.finditer(result.stdout):
+                    if event.group(2) == stack_name:
+                        stack_status = event.group(1)
+            if stack_status:
+                # sam deploy printed everything the describe call would return
+                # except the stack ARN, so StackId is left out rather than
+                # returned empty
+                stack_info = {
+                    'StackName': stack_name,
+                    'StackStatus': stack_status,
+                    'Outputs': outputs
+                }
+                logger.info(f"Stack status: {stack_info['StackStatus']}")
+            elif wait:
+                from botocore.exceptions import ClientError
                 try:
-                    cf_client = self._get_cloudformation_client(region)
-                    response = cf_client.describe_stacks(StackName=stack_name)
-                    if response['Stacks']:
-                        stack = response['Stacks'][0]
+                    stack = self._describe_stack(stack_name, region, use_batch=False)
+                    if stack is not None:
                         stack_info = {
                             'StackId': stack.get('StackId'),
                             'StackName': stack.get('StackName'),
                             'StackStatus': stack.get('StackStatus'),
-                            'Outputs': {
-                                output['OutputKey']: output['OutputValue']
-                                for output in stack.get('Outputs', [])
-                            }
+                            'Outputs': dict(
+                                (output['OutputKey'], output['OutputValue'])
+                                for output in stack.get('Outputs', ())
+                            )
                         }
                         logger.info(f"Stack status: {stack_info['StackStatus']}")
                 except ClientError as e:
@@ -589,6 +1037,8 @@ class SAMDeployHook:
             error_msg = f"SAM deploy timed out after {timeout} seconds"
             logger.error(error_msg)
             raise SAMDeployError(error_msg)
+        except SAMDeployError:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error during SAM deployment: {e}")
             raise SAMDeployError(f"SAM deployment failed: {e}")
@@ -610,6 +1060,7 @@ def cfngin_hook(
     working_directory: Optional[str] = None,
     skip_build: bool = False,
     resolve_image_repos: bool = True,
+    skip_failed_stack_check: bool = False,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -630,6 +1081,7 @@ def cfngin_hook(
         timeout: Timeout in seconds
         working_directory: Directory to run SAM command from
         skip_build: Skip the sam build step (default: False)
+        skip_failed_stack_check: Skip the pre-deploy failed-stack check (default: False)
         **kwargs: Additional arguments
         
     Returns:
@@ -640,8 +1092,9 @@ def cfngin_hook(
         region = getattr(provider, 'region', 'us-east-1')
     
     logger.info(f"CFNgin SAM deploy hook called for stack: {stack_name}")
+    _ensure_env_loaded()
     
-    hook = SAMDeployHook()
+    hook = SAMDeployHook(batch_describe=True)
     
     try:
         result = hook.deploy_sam_template(
@@ -657,7 +1110,8 @@ def cfngin_hook(
             timeout=timeout,
             working_directory=working_directory,
             skip_build=skip_build,
-            resolve_image_repos=resolve_image_repos
+            resolve_image_repos=resolve_image_repos,
+            skip_failed_stack_check=skip_failed_stack_check
         )
         
         logger.info(f"SAM deployment successful for stack: {stack_name}")
@@ -702,8 +1156,9 @@ def cfngin_delete_hook(
         region = getattr(provider, 'region', 'us-east-1')
     
     logger.info(f"CFNgin SAM delete hook called for stack: {stack_name}")
+    _ensure_env_loaded()
     
-    hook = SAMDeployHook()
+    hook = SAMDeployHook(batch_describe=True)
     
     try:
         result = hook.delete_sam_stack(
@@ -725,8 +1180,32 @@ def cfngin_delete_hook(
         raise SAMDeployError(f"Delete hook execution failed: {e}")
 
 
-def main():
-    """Command line interface for SAM deployment and deletion."""
+# Options of the deploy subcommand, which legacy invocations also use, as
+# (flags, add_argument keyword arguments). Destinations match the keyword
+# arguments of deploy_sam_template so main() can pass them straight through
+DEPLOY_ARGUMENTS = (
+    (('--template', '--template-file'), {'dest': 'template_file', 'required': True,
+                                         'help': 'Path to SAM template file'}),
+    (('--stack-name',), {'required': True, 'help': 'CloudFormation stack name'}),
+    (('--config-file',), {'help': 'Path to SAM config file (samconfig.toml)'}),
+    (('--env',), {'help': 'Environment name for config'}),
+    (('--parameters',), {'nargs': '*', 'help': 'Parameter overrides in key=value format'}),
+    (('--param-file',), {'help': 'Path to JSON file containing parameter key-value pairs'}),
+    (('--capabilities',), {'nargs': '*',
+                           'help': 'IAM capabilities (default: CAPABILITY_IAM CAPABILITY_NAMED_IAM)'}),
+    (('--region',), {'default': 'us-east-1', 'help': 'AWS region (default: us-east-1)'}),
+    (('--no-wait',), {'action': 'store_true', 'help': 'Do not wait for deployment completion'}),
+    (('--timeout',), {'type': int, 'default': 1800, 'help': 'Timeout in seconds (default: 1800)'}),
+    (('--working-directory',), {'help': 'Directory to run SAM command from'}),
+    (('--skip-build',), {'action': 'store_true', 'help': 'Skip the sam build step'}),
+    (('--skip-stack-check',), {'dest': 'skip_failed_stack_check', 'action': 'store_true',
+                               'help': 'Skip the check for a stack left in a failed state'}),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser on first use; hook imports never pay for it."""
     parser = argparse.ArgumentParser(
         description='Deploy or delete AWS SAM templates',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -769,74 +1248,8 @@ Examples:
     
     # Deploy subcommand
     deploy_parser = subparsers.add_parser('deploy', help='Deploy SAM template')
-    deploy_parser.add_argument(
-        '--template', '--template-file',
-        required=True,
-        help='Path to SAM template file'
-    )
-    
-    deploy_parser.add_argument(
-        '--stack-name',
-        required=True,
-        help='CloudFormation stack name'
-    )
-    
-    deploy_parser.add_argument(
-        '--config-file',
-        help='Path to SAM config file (samconfig.toml)'
-    )
-    
-    deploy_parser.add_argument(
-        '--env',
-        help='Environment name for config'
-    )
-    
-    deploy_parser.add_argument(
-        '--parameters',
-        nargs='*',
-        help='Parameter overrides in key=value format'
-    )
-    
-    deploy_parser.add_argument(
-        '--param-file',
-        help='Path to JSON file containing parameter key-value pairs'
-    )
-    
-    deploy_parser.add_argument(
-        '--capabilities',
-        nargs='*',
-        help='IAM capabilities (default: CAPABILITY_IAM CAPABILITY_NAMED_IAM)'
-    )
-    
-    deploy_parser.add_argument(
-        '--region',
-        default='us-east-1',
-        help='AWS region (default: us-east-1)'
-    )
-    
-    deploy_parser.add_argument(
-        '--no-wait',
-        action='store_true',
-        help='Do not wait for deployment completion'
-    )
-    
-    deploy_parser.add_argument(
-        '--timeout',
-        type=int,
-        default=1800,
-        help='Timeout in seconds (default: 1800)'
-    )
-    
-    deploy_parser.add_argument(
-        '--working-directory',
-        help='Directory to run SAM command from'
-    )
-    
-    deploy_parser.add_argument(
-        '--skip-build',
-        action='store_true',
-        help='Skip the sam build step'
-    )
+    for flags, options in DEPLOY_ARGUMENTS:
+        deploy_parser.add_argument(*flags, **options)
     
     # Delete subcommand
     delete_parser = subparsers.add_parser('delete', help='Delete SAM stack')
@@ -879,130 +1292,67 @@ Examples:
             help='Enable verbose logging'
         )
     
-    # Handle legacy usage (backward compatibility)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['deploy', 'delete']:
-        # Legacy mode - assume deploy command
-        legacy_parser = argparse.ArgumentParser(
-            description='Deploy AWS SAM templates (legacy mode)',
-            formatter_class=argparse.RawDescriptionHelpFormatter
-        )
-        
-        legacy_parser.add_argument(
-            '--template', '--template-file',
-            required=True,
-            help='Path to SAM template file'
-        )
-        
-        legacy_parser.add_argument(
-            '--stack-name',
-            required=True,
-            help='CloudFormation stack name'
-        )
-        
-        legacy_parser.add_argument(
-            '--config-file',
-            help='Path to SAM config file (samconfig.toml)'
-        )
-        
-        legacy_parser.add_argument(
-            '--env',
-            help='Environment name for config'
-        )
-        
-        legacy_parser.add_argument(
-            '--parameters',
-            nargs='*',
-            help='Parameter overrides in key=value format'
-        )
-        
-        legacy_parser.add_argument(
-            '--param-file',
-            help='Path to JSON file containing parameter key-value pairs'
-        )
-        
-        legacy_parser.add_argument(
-            '--capabilities',
-            nargs='*',
-            help='IAM capabilities (default: CAPABILITY_IAM CAPABILITY_NAMED_IAM)'
-        )
-        
-        legacy_parser.add_argument(
-            '--region',
-            default='us-east-1',
-            help='AWS region (default: us-east-1)'
-        )
-        
-        legacy_parser.add_argument(
-            '--no-wait',
-            action='store_true',
-            help='Do not wait for deployment completion'
-        )
-        
-        legacy_parser.add_argument(
-            '--timeout',
-            type=int,
-            default=1800,
-            help='Timeout in seconds (default: 1800)'
-        )
-        
-        legacy_parser.add_argument(
-            '--working-directory',
-            help='Directory to run SAM command from'
-        )
-        
-        legacy_parser.add_argument(
-            '--skip-build',
-            action='store_true',
-            help='Skip the sam build step'
-        )
-        
-        legacy_parser.add_argument(
-            '--verbose', '-v',
-            action='store_true',
-            help='Enable verbose logging'
-        )
+    # Running without a subcommand still needs the attributes main() reads
+    parser.set_defaults(command=None, verbose=False)
+    
+    return parser
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Invocations that do not start with a subcommand predate them and are
+    parsed as deploys, so one parser serves both forms.
+    
+    Args:
+        argv: Arguments without the program name
         
-        args = legacy_parser.parse_args()
-        args.command = 'deploy'  # Set command for legacy mode
-    else:
-        args = parser.parse_args()
+    Returns:
+        Parsed arguments
+    """
+    if argv and argv[0] not in ('deploy', 'delete', '-h', '--help'):
+        argv = ['deploy', *argv]
+    return _build_parser().parse_args(argv)
+
+
+def main():
+    """Command line interface for SAM deployment and deletion."""
+    _ensure_env_loaded()
+    
+    args = _parse_args(sys.argv[1:])
     
     # Configure logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
     # Handle missing command
-    if not hasattr(args, 'command') or not args.command:
-        parser.print_help()
+    if not args.command:
+        _build_parser().print_help()
         return 1
     
+    # Everything else on the namespace is a hook keyword argument
+    options = dict(vars(args))
+    del options['command'], options['verbose']
+    wait = not options.pop('no_wait')
+    
     try:
         hook = SAMDeployHook()
         
         if args.command == 'deploy':
             # Parse parameters
             parameters = {}
-            if hasattr(args, 'parameters') and args.parameters:
-                for param in args.parameters:
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        parameters[key] = value
-                    else:
-                        logger.warning(f"Invalid parameter format: {param} (expected key=value)")
+            for param in options.pop('parameters') or ():
+                key, sep, value = param.partition('=')
+                if sep:
+                    parameters[key] = value
+                else:
+                    logger.warning(f"Invalid parameter format: {param} (expected key=value)")
             
             result = hook.deploy_sam_template(
-                template_file=args.template,
-                stack_name=args.stack_name,
-                config_file=getattr(args, 'config_file', None),
-                env=getattr(args, 'env', None),
-                parameters=parameters if parameters else None,
-                param_file=getattr(args, 'param_file', None),
-                capabilities=getattr(args, 'capabilities', None),
-                region=args.region,
-                wait=not args.no_wait,
-                timeout=args.timeout,
-                working_directory=getattr(args, 'working_directory', None),
-                skip_build=getattr(args, 'skip_build', False)
+                parameters=parameters or None,
+                wait=wait,
+                **options
             )
             
             print(f"✅ SAM deployment successful!")
@@ -1015,13 +1365,7 @@ Examples:
                     print(f"  {key}: {value}")
         
         elif args.command == 'delete':
-            result = hook.delete_sam_stack(
-                stack_name=args.stack_name,
-                region=args.region,
-                wait=not args.no_wait,
-                timeout=args.timeout,
-                retain_resources=getattr(args, 'retain_resources', None)
-            )
+            result = hook.delete_sam_stack(wait=wait, **options)
             
             print(f"✅ SAM stack deletion successful!")
             print(f"Stack Name: {result['stack_name']}")
@@ -15,33 +15,41 @@ from cloudfront_invalidation import (
     create_invalidation,
     wait_for_invalidation,
     cfngin_hook,
-    CloudFrontInvalidationError
+    invalidate_distributions,
+    CloudFrontInvalidationError,
+    _get_client
 )
 
 
 class TestCloudFrontInvalidation(unittest.TestCase):
     """Test cases for CloudFront invalidation hook."""
     
+    distribution_id = "E1234567890ABC"
+    invalidation_id = "I1234567890DEF"
+    create_response = {
+        'Invalidation': {
+            'Id': invalidation_id,
+            'Status': 'InProgress'
+        }
+    }
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.distribution_id = "E1234567890ABC"
-        self.invalidation_id = "I1234567890DEF"
+        # Patch the boto3 client once per test instead of per-method decorators
+        self.mock_client = Mock()
+        patcher = patch(
+            'boto3.client', return_value=self.mock_client
+        )
+        self.mock_boto3_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        # The client is cached per process; keep mocks from leaking across tests
+        _get_client.cache_clear()
+        self.addCleanup(_get_client.cache_clear)
         
-    @patch('cloudfront_invalidation.boto3.client')
-    def test_create_invalidation_success(self, mock_boto3_client):
+    def test_create_invalidation_success(self):
         """Test successful invalidation creation."""
-        # Mock CloudFront client
-        mock_client = Mock()
-        mock_boto3_client.return_value = mock_client
-        
-        # Mock response
-        mock_response = {
-            'Invalidation': {
-                'Id': self.invalidation_id,
-                'Status': 'InProgress'
-            }
-        }
-        mock_client.create_invalidation.return_value = mock_response
+        mock_client = self.mock_client
+        mock_client.create_invalidation.return_value = self.create_response
         
         # Test the function
         result = create_invalidation(self.distribution_id)
@@ -58,21 +66,10 @@ class TestCloudFrontInvalidation(unittest.TestCase):
         self.assertEqual(call_args['DistributionId'], self.distribution_id)
         self.assertEqual(call_args['InvalidationBatch']['Paths']['Items'], ['/*'])
     
-    @patch('cloudfront_invalidation.boto3.client')
-    def test_create_invalidation_custom_paths(self, mock_boto3_client):
+    def test_create_invalidation_custom_paths(self):
         """Test invalidation creation with custom paths."""
-        # Mock CloudFront client
-        mock_client = Mock()
-        mock_boto3_client.return_value = mock_client
-        
-        # Mock response
-        mock_response = {
-            'Invalidation': {
-                'Id': self.invalidation_id,
-                'Status': 'InProgress'
-            }
-        }
-        mock_client.create_invalidation.return_value = mock_response
+        mock_client = self.mock_client
+        mock_client.create_invalidation.return_value = self.create_response
         
         # Test with custom paths
         custom_paths = ['/api/*', '/assets/*', '/index.html']
@@ -86,12 +83,28 @@ class TestCloudFrontInvalidation(unittest.TestCase):
         self.assertEqual(call_args['InvalidationBatch']['Paths']['Items'], custom_paths)
         self.assertEqual(call_args['InvalidationBatch']['Paths']['Quantity'], len(custom_paths))
     
-    @patch('cloudfront_invalidation.boto3.client')
-    def test_create_invalidation_no_such_distribution(self, mock_boto3_client):
+    def test_create_invalidation_unique_caller_reference(self):
+        """Test back-to-back invalidations get distinct caller references."""
+        self.mock_client.create_invalidation.return_value = self.create_response
+        
+        first = create_invalidation(self.distribution_id)
+        second = create_invalidation(self.distribution_id)
+        
+        self.assertNotEqual(first['caller_reference'], second['caller_reference'])
+        self.assertTrue(first['caller_reference'].startswith('runway-hook-'))
+    
+    def test_client_is_shared_between_calls(self):
+        """Test the CloudFront client is created once for repeated calls."""
+        self.mock_client.create_invalidation.return_value = self.create_response
+        
+        create_invalidation(self.distribution_id)
+        wait_for_invalidation(self.distribution_id, self.invalidation_id)
+        
+        self.mock_boto3_client.assert_called_once_with("cloudfront")
+    
+    def test_create_invalidation_no_such_distribution(self):
         """Test invalidation creation with non-existent distribution."""
-        # Mock CloudFront client
-        mock_client = Mock()
-        mock_boto3_client.return_value = mock_client
+        mock_client = self.mock_client
         
         # Mock ClientError
         from botocore.exceptions import ClientError
@@ -109,28 +122,44 @@ class TestCloudFrontInvalidation(unittest.TestCase):
         
         self.assertIn("not found", str(context.exception))
     
-    @patch('cloudfront_invalidation.boto3.client')
-    @patch('cloudfront_invalidation.time.sleep')
-    def test_wait_for_invalidation_success(self, mock_sleep, mock_boto3_client):
+    def test_wait_for_invalidation_success(self):
         """Test waiting for invalidation completion."""
-        # Mock CloudFront client
-        mock_client = Mock()
-        mock_boto3_client.return_value = mock_client
-        
-        # Mock responses - first InProgress, then Completed
-        mock_responses = [
-            {'Invalidation': {'Status': 'InProgress'}},
-            {'Invalidation': {'Status': 'Completed'}}
-        ]
-        mock_client.get_invalidation.side_effect = mock_responses
+        mock_waiter = self.mock_client.get_waiter.return_value
         
         # Test the function
         result = wait_for_invalidation(self.distribution_id, self.invalidation_id, timeout=60)
         
         # Assertions
         self.assertTrue(result)
-        self.assertEqual(mock_client.get_invalidation.call_count, 2)
-        mock_sleep.assert_called_once_with(30)
+        self.mock_client.get_waiter.assert_called_once_with('invalidation_completed')
+        mock_waiter.wait.assert_called_once_with(
+            DistributionId=self.distribution_id,
+            Id=self.invalidation_id,
+            WaiterConfig={'Delay': 5, 'MaxAttempts': 12}
+        )
+    
+    def test_wait_for_invalidation_timeout(self):
+        """Test an invalidation still in progress at the timeout returns False."""
+        from botocore.exceptions import WaiterError
+        self.mock_client.get_waiter.return_value.wait.side_effect = WaiterError(
+            'InvalidationCompleted', 'Max attempts exceeded',
+            {'Invalidation': {'Status': 'InProgress'}}
+        )
+        
+        self.assertFalse(wait_for_invalidation(self.distribution_id, self.invalidation_id, timeout=60))
+    
+    def test_wait_for_invalidation_error(self):
+        """Test an API error while waiting raises CloudFrontInvalidationError."""
+        from botocore.exceptions import WaiterError
+        self.mock_client.get_waiter.return_value.wait.side_effect = WaiterError(
+            'InvalidationCompleted', 'Unexpected error',
+            {'Error': {'Code': 'NoSuchInvalidation', 'Message': 'Not found'}}
+        )
+        
+        with self.assertRaises(CloudFrontInvalidationError) as context:
+            wait_for_invalidation(self.distribution_id, self.invalidation_id)
+        
+        self.assertIn("NoSuchInvalidation", str(context.exception))
     
     def test_cfngin_hook_missing_distribution_id(self):
         """Test CFNgin hook with missing distribution_id."""
@@ -140,7 +169,8 @@ class TestCloudFrontInvalidation(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             cfngin_hook(provider, context)
         
-        self.assertIn("distribution_id parameter is required", str(context.exception))
+        self.assertIn("distribution_id or distribution_ids parameter is required",
+                      str(context.exception))
     
     @patch('cloudfront_invalidation.create_invalidation')
     def test_cfngin_hook_success(self, mock_create_invalidation):
@@ -194,6 +224,73 @@ class TestCloudFrontInvalidation(unittest.TestCase):
         self.assertTrue(result['completed'])
         mock_wait.assert_called_once_with(self.distribution_id, self.invalidation_id, 300)
 
+    
+    def test_invalidate_distributions(self):
+        """Test several distributions are invalidated and waited on."""
+        self.mock_client.create_invalidation.return_value = self.create_response
+        ids = ['E1', 'E2', 'E3']
+        
+        results = invalidate_distributions(ids, ['/index.html'], wait=True, timeout=60)
+        
+        self.assertEqual(list(results), ids)
+        self.assertTrue(all(result['completed'] for result in results.values()))
+        self.assertEqual(
+            sorted(c[1]['DistributionId'] for c in self.mock_client.create_invalidation.call_args_list),
+            ids
+        )
+        self.assertEqual(self.mock_client.get_waiter.return_value.wait.call_count, 3)
+    
+    def test_invalidate_distributions_reports_failures(self):
+        """Test a failed distribution is reported after the others finish."""
+        from botocore.exceptions import ClientError
+        
+        def create(DistributionId, **kwargs):
+            if DistributionId == 'E2':
+                raise ClientError(
+                    {'Error': {'Code': 'NoSuchDistribution', 'Message': 'missing'}},
+                    'CreateInvalidation'
+                )
+            return self.create_response
+        
+        self.mock_client.create_invalidation.side_effect = create
+        
+        with self.assertRaises(CloudFrontInvalidationError) as context:
+            invalidate_distributions(['E1', 'E2', 'E3'])
+        
+        self.assertIn("E2: Distribution E2 not found", str(context.exception))
+        self.assertEqual(self.mock_client.create_invalidation.call_count, 3)
+    
+    @patch('cloudfront_invalidation.invalidate_distributions')
+    def test_cfngin_hook_distribution_ids(self, mock_invalidate):
+        """Test CFNgin hook invalidates a list of distributions together."""
+        mock_invalidate.return_value = {'E1': {}, 'E2': {}}
+        
+        result = cfngin_hook(Mock(), Mock(), distribution_ids=['E1', 'E2'], wait=True)
+        
+        self.assertEqual(result, {'invalidations': {'E1': {}, 'E2': {}}})
+        mock_invalidate.assert_called_once_with(['E1', 'E2'], ['/*'], True, 900)
+    
+    @patch('cloudfront_invalidation.invalidate_distributions')
+    def test_cfngin_hook_distribution_ids_string(self, mock_invalidate):
+        """Test a single distribution_ids string is not split into characters."""
+        cfngin_hook(Mock(), Mock(), distribution_ids='E123ABC')
+        
+        mock_invalidate.assert_called_once_with(['E123ABC'], ['/*'], False, 900)
+    
+    @patch('cloudfront_invalidation.invalidate_distributions')
+    def test_cfngin_hook_distribution_ids_merges_distribution_id(self, mock_invalidate):
+        """Test distribution_id is invalidated along with distribution_ids."""
+        cfngin_hook(Mock(), Mock(), distribution_id='E0', distribution_ids=['E1', 'E0'])
+        
+        mock_invalidate.assert_called_once_with(['E0', 'E1'], ['/*'], False, 900)
+    
+    def test_cfngin_hook_distribution_ids_invalid_type(self):
+        """Test a distribution_ids value that is not a list is rejected."""
+        with self.assertRaises(ValueError) as context:
+            cfngin_hook(Mock(), Mock(), distribution_ids={'id': 'E1'})
+        
+        self.assertIn("must be a list", str(context.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Test script for NPM build and S3 sync hook.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, call, patch
+
+from botocore.exceptions import ClientError
+
+# Add the hooks directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from npm_build import (
+    LONG_CACHE_CONTROL,
+    MANIFEST_KEY,
+    NO_CACHE_CONTROL,
+    _compress_paths,
+    _delete_keys,
+    _file_md5,
+    _list_bucket_keys,
+    _parse_accelerate,
+    _upload_extra_args,
+    _use_accelerate,
+    _wait_for_invalidation,
+    build_and_sync_app,
+    sync_directory_to_s3,
+)
+
+
+class TestSyncDirectoryToS3(unittest.TestCase):
+    """Test cases for the S3 uploader."""
+
+    def setUp(self):
+        """Set up a small build output tree."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = Path(self.temp_dir)
+        (self.output_dir / "_next" / "static").mkdir(parents=True)
+        (self.output_dir / "index.html").write_text("<html></html>")
+        (self.output_dir / "data.json").write_text("{}")
+        (self.output_dir / "_next" / "static" / "app.js").write_text("console.log(1)")
+
+        self.s3_client = Mock()
+        self.s3_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "index.html"}, {"Key": "old.js"}],
+            "IsTruncated": False,
+        }
+        self.s3_client.delete_objects.return_value = {}
+        self.s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "GetObject"
+        )
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def uploaded(self):
+        """Map uploaded keys to the ExtraArgs they were sent with."""
+        return {
+            call.args[2]: call.kwargs["ExtraArgs"]
+            for call in self.s3_client.upload_file.call_args_list
+        }
+
+    def test_sync_sets_headers_on_upload(self):
+        """Test content type and cache control are set in the initial PUT."""
+        result = sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        self.assertTrue(result)
+        uploaded = self.uploaded()
+        self.assertEqual(
+            set(uploaded), {"index.html", "data.json", "_next/static/app.js"}
+        )
+        self.assertEqual(uploaded["index.html"]["ContentType"], "text/html")
+        self.assertEqual(uploaded["index.html"]["CacheControl"], NO_CACHE_CONTROL)
+        self.assertEqual(uploaded["data.json"]["ContentType"], "application/json")
+        self.assertEqual(
+            uploaded["_next/static/app.js"]["CacheControl"], LONG_CACHE_CONTROL
+        )
+
+    def test_upload_extra_args_build_artifacts(self):
+        """Test content types for artifacts missing from default mime maps."""
+        self.assertEqual(
+            _upload_extra_args("_next/static/app.js.map")["ContentType"],
+            "application/json",
+        )
+        self.assertEqual(
+            _upload_extra_args("fonts/inter.woff2")["ContentType"], "font/woff2"
+        )
+        self.assertEqual(
+            _upload_extra_args("LICENSE")["ContentType"], "application/octet-stream"
+        )
+
+    def test_sync_uploads_assets_before_pages(self):
+        """Test static assets are uploaded before HTML/JSON files."""
+        sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        keys = [call.args[2] for call in self.s3_client.upload_file.call_args_list]
+        self.assertEqual(keys[0], "_next/static/app.js")
+
+    def test_sync_on_first_page_after_assets(self):
+        """Test the first-page callback fires after assets are uploaded."""
+        events = []
+        self.s3_client.upload_file.side_effect = (
+            lambda path, bucket, key, **kwargs: events.append(key)
+        )
+
+        sync_directory_to_s3(
+            self.output_dir,
+            "bucket",
+            self.s3_client,
+            on_first_page=lambda: events.append("callback"),
+        )
+
+        self.assertEqual(events[0], "_next/static/app.js")
+        self.assertEqual(events.count("callback"), 1)
+        self.assertGreater(events.index("callback"), 1)
+
+    def test_sync_deletes_stale_objects(self):
+        """Test objects missing locally are removed in a batch."""
+        sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        self.s3_client.delete_objects.assert_called_once()
+        delete = self.s3_client.delete_objects.call_args.kwargs["Delete"]
+        self.assertEqual(delete["Objects"], [{"Key": "old.js"}])
+
+    def test_sync_skips_unchanged_files(self):
+        """Test files matching the previous manifest are not re-uploaded."""
+        previous = {
+            "index.html": _file_md5(self.output_dir / "index.html"),
+            "data.json": "stale-hash",
+            "_next/static/app.js": _file_md5(
+                self.output_dir / "_next" / "static" / "app.js"
+            ),
+            "old.js": "removed",
+        }
+        body = Mock()
+        body.read.return_value = json.dumps(previous).encode("utf-8")
+        self.s3_client.get_object.side_effect = None
+        self.s3_client.get_object.return_value = {"Body": body}
+
+        result = sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        self.assertTrue(result)
+        self.assertEqual(set(self.uploaded()), {"data.json"})
+        self.s3_client.list_objects_v2.assert_not_called()
+        delete = self.s3_client.delete_objects.call_args.kwargs["Delete"]
+        self.assertEqual(delete["Objects"], [{"Key": "old.js"}])
+
+    def test_sync_writes_manifest(self):
+        """Test the manifest of uploaded files is written to the bucket."""
+        sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        self.s3_client.put_object.assert_called_once()
+        call_kwargs = self.s3_client.put_object.call_args.kwargs
+        self.assertEqual(call_kwargs["Key"], MANIFEST_KEY)
+        manifest = json.loads(call_kwargs["Body"])
+        self.assertEqual(
+            set(manifest), {"index.html", "data.json", "_next/static/app.js"}
+        )
+
+    def test_sync_compress_text_assets(self):
+        """Test large text assets are gzipped in memory before upload."""
+        script = self.output_dir / "_next" / "static" / "app.js"
+        script.write_text("console.log(1);\n" * 200)
+
+        result = sync_directory_to_s3(
+            self.output_dir, "bucket", self.s3_client, compress=True
+        )
+
+        self.assertTrue(result)
+        self.s3_client.upload_fileobj.assert_called_once()
+        call = self.s3_client.upload_fileobj.call_args
+        self.assertEqual(call.args[2], "_next/static/app.js")
+        self.assertEqual(call.kwargs["ExtraArgs"]["ContentEncoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(call.args[0].getvalue()), script.read_bytes()
+        )
+        # Small files are uploaded as-is and the file on disk is untouched
+        self.assertEqual(set(self.uploaded()), {"index.html", "data.json"})
+        self.assertTrue(script.read_text().startswith("console.log"))
+
+        manifest = json.loads(self.s3_client.put_object.call_args.kwargs["Body"])
+        self.assertTrue(manifest["_next/static/app.js"].endswith(":gzip"))
+
+    def test_sync_compress_skips_incompressible_assets(self):
+        """Test assets that gzip saves less than 10% on are uploaded uncompressed."""
+        script = self.output_dir / "_next" / "static" / "app.js"
+        script.write_bytes(os.urandom(4096))
+
+        result = sync_directory_to_s3(
+            self.output_dir, "bucket", self.s3_client, compress=True
+        )
+
+        self.assertTrue(result)
+        call = self.s3_client.upload_fileobj.call_args
+        self.assertEqual(call.args[2], "_next/static/app.js")
+        self.assertNotIn("ContentEncoding", call.kwargs["ExtraArgs"])
+        self.assertEqual(call.args[0].getvalue(), script.read_bytes())
+
+    def test_file_md5(self):
+        """Test file hashing, including empty files."""
+        empty = self.output_dir / "empty.txt"
+        empty.write_bytes(b"")
+
+        self.assertEqual(_file_md5(empty), "d41d8cd98f00b204e9800998ecf8427e")
+        self.assertEqual(
+            _file_md5(self.output_dir / "data.json"),
+            "99914b932bd37a50b983c5e7c90ae93b",
+        )
+
+    def test_delete_keys_batches(self):
+        """Test deletes are split into 1000-key DeleteObjects requests."""
+        keys = [f"chunk-{i}.js" for i in range(2500)]
+
+        _delete_keys(self.s3_client, "bucket", keys)
+
+        sizes = sorted(
+            len(call.kwargs["Delete"]["Objects"])
+            for call in self.s3_client.delete_objects.call_args_list
+        )
+        self.assertEqual(sizes, [500, 1000, 1000])
+
+    def test_list_bucket_keys_by_prefix(self):
+        """Test large buckets are listed per top-level prefix."""
+        self.s3_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "index.html"}],
+            "IsTruncated": True,
+        }
+        pages = {
+            None: [
+                {
+                    "Contents": [{"Key": "index.html"}],
+                    "CommonPrefixes": [{"Prefix": "_next/"}, {"Prefix": "img/"}],
+                }
+            ],
+            "_next/": [{"Contents": [{"Key": "_next/a.js"}]}],
+            "img/": [{"Contents": [{"Key": "img/a.png"}]}, {"Contents": []}],
+        }
+        paginator = Mock()
+        paginator.paginate.side_effect = lambda **kwargs: pages[kwargs.get("Prefix")]
+        self.s3_client.get_paginator.return_value = paginator
+
+        keys = _list_bucket_keys(self.s3_client, "bucket")
+
+        self.assertEqual(keys, {"index.html", "_next/a.js", "img/a.png"})
+
+    def test_sync_upload_failure(self):
+        """Test upload errors are reported as failure."""
+        self.s3_client.upload_file.side_effect = Exception("Access Denied")
+
+        result = sync_directory_to_s3(self.output_dir, "bucket", self.s3_client)
+
+        self.assertFalse(result)
+        self.s3_client.delete_objects.assert_not_called()
+
+    @patch("npm_build._client")
+    def test_sync_accelerate_falls_back_to_standard_endpoint(self, mock_client):
+        """Test a bucket without acceleration is synced through the standard endpoint."""
+        accelerated_client = Mock()
+        accelerated_client.get_object.side_effect = ClientError(
+            {
+                "Error": {
+                    "Code": "InvalidRequest",
+                    "Message": "S3 Transfer Acceleration is not configured on this bucket",
+                }
+            },
+            "GetObject",
+        )
+        mock_client.side_effect = [accelerated_client, self.s3_client]
+
+        result = sync_directory_to_s3(self.output_dir, "bucket", accelerate=True)
+
+        self.assertTrue(result)
+        self.assertEqual(mock_client.call_args_list, [call("s3", True), call("s3")])
+        self.assertEqual(
+            set(self.uploaded()), {"index.html", "data.json", "_next/static/app.js"}
+        )
+
+    def test_sync_invalid_request_without_acceleration_fails(self):
+        """Test InvalidRequest errors are not retried when acceleration is off."""
+        self.s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "InvalidRequest", "Message": "Bad request"}},
+            "GetObject",
+        )
+
+        self.assertFalse(sync_directory_to_s3(self.output_dir, "bucket", self.s3_client))
+
+
+class TestUseAccelerate(unittest.TestCase):
+    """Test cases for Transfer Acceleration detection."""
+
+    def test_use_accelerate_explicit(self):
+        """Test explicit flags are used as-is."""
+        self.assertTrue(_use_accelerate("bucket", True))
+        self.assertFalse(_use_accelerate("bucket", False))
+        self.assertTrue(_use_accelerate("bucket", "True"))
+        self.assertFalse(_use_accelerate("bucket", "false"))
+        self.assertFalse(_use_accelerate("bucket", "False"))
+
+    def test_parse_accelerate_rejects_unknown_values(self):
+        """Test anything but true, false or auto is rejected."""
+        self.assertEqual(_parse_accelerate("Auto"), "auto")
+        for value in ("yes", "", "0", None, 1):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    _parse_accelerate(value)
+
+    @patch("npm_build._client")
+    def test_use_accelerate_auto(self, mock_client):
+        """Test auto mode follows the bucket configuration."""
+        s3_client = mock_client.return_value
+        s3_client.get_bucket_accelerate_configuration.return_value = {
+            "Status": "Enabled"
+        }
+        self.assertTrue(_use_accelerate("bucket", "auto"))
+
+        s3_client.get_bucket_accelerate_configuration.return_value = {}
+        self.assertFalse(_use_accelerate("bucket", "auto"))
+
+    @patch("npm_build._client")
+    def test_use_accelerate_auto_access_denied(self, mock_client):
+        """Test auto mode falls back to the standard endpoint on errors."""
+        mock_client.return_value.get_bucket_accelerate_configuration.side_effect = (
+            ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "Denied"}},
+                "GetBucketAccelerateConfiguration",
+            )
+        )
+        self.assertFalse(_use_accelerate("bucket", "auto"))
+
+
+class TestCompressPaths(unittest.TestCase):
+    """Test cases for invalidation path compression."""
+
+    def test_compress_paths_keeps_small_lists(self):
+        """Test short path lists are only deduplicated."""
+        paths = ["/index.html", "/about.html", "/index.html"]
+
+        self.assertEqual(_compress_paths(paths), ["/index.html", "/about.html"])
+
+    def test_compress_paths_collapses_siblings(self):
+        """Test many siblings collapse to a directory wildcard."""
+        paths = [f"/_next/static/chunk-{i}.js" for i in range(20)] + ["/index.html"]
+
+        self.assertEqual(_compress_paths(paths), ["/_next/static/*", "/index.html"])
+
+    def test_compress_paths_drops_covered_paths(self):
+        """Test paths under an existing wildcard are removed."""
+        paths = ["/assets/*", "/assets/logo.png", "/assets/img/a.png", "/robots.txt"]
+
+        self.assertEqual(_compress_paths(paths), ["/assets/*", "/robots.txt"])
+
+    def test_compress_paths_root_wildcard(self):
+        """Test the root wildcard covers everything."""
+        self.assertEqual(_compress_paths(["/*", "/index.html"]), ["/*"])
+
+    def test_compress_paths_over_limit(self):
+        """Test falling back to the root wildcard above the path limit."""
+        paths = [f"/page-{i}/index.html" for i in range(3001)]
+
+        self.assertEqual(_compress_paths(paths), ["/*"])
+
+    def test_compress_paths_over_wildcard_limit(self):
+        """Test falling back to the root wildcard above the wildcard limit."""
+        paths = [f"/dir-{d}/file-{f}.js" for d in range(20) for f in range(16)]
+
+        self.assertEqual(_compress_paths(paths), ["/*"])
+
+    def test_compress_paths_at_wildcard_limit(self):
+        """Test up to the wildcard limit the directory wildcards are kept."""
+        paths = [f"/dir-{d}/file-{f}.js" for d in range(15) for f in range(16)]
+
+        self.assertEqual(_compress_paths(paths), [f"/dir-{d}/*" for d in range(15)])
+
+
+class TestWaitForInvalidation(unittest.TestCase):
+    """Test cases for invalidation polling."""
+
+    @patch("npm_build.time.sleep")
+    def test_wait_backs_off_until_completed(self, mock_sleep):
+        """Test polling starts at 5s and backs off exponentially."""
+        cloudfront = Mock()
+        cloudfront.get_invalidation.side_effect = [
+            {"Invalidation": {"Status": "InProgress"}},
+            {"Invalidation": {"Status": "InProgress"}},
+            {"Invalidation": {"Status": "Completed"}},
+        ]
+
+        self.assertTrue(_wait_for_invalidation(cloudfront, "E123", "I123"))
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list], [5, 7.5]
+        )
+
+    @patch("npm_build.time.sleep")
+    @patch("npm_build.time.monotonic")
+    def test_wait_timeout(self, mock_monotonic, mock_sleep):
+        """Test polling gives up once the deadline passes."""
+        mock_monotonic.side_effect = [0, 10, 5000]
+        cloudfront = Mock()
+        cloudfront.get_invalidation.return_value = {
+            "Invalidation": {"Status": "InProgress"}
+        }
+
+        self.assertFalse(_wait_for_invalidation(cloudfront, "E123", "I123"))
+        mock_sleep.assert_called_once_with(5)
+
+
+class TestBuildAndSyncApp(unittest.TestCase):
+    """Test cases for the build and sync hook."""
+
+    def setUp(self):
+        """Set up an app directory with a build output."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.app_dir = Path(self.temp_dir).resolve()
+        (self.app_dir / "node_modules").mkdir()
+        (self.app_dir / "out").mkdir()
+        (self.app_dir / ".env.prod").write_text("API_URL=https://example.com\n")
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch("npm_build.sync_directory_to_s3")
+    @patch("npm_build._run_streamed")
+    def test_build_runs_in_app_dir(self, mock_run, mock_sync):
+        """Test commands run with cwd set and the process cwd is untouched."""
+        mock_run.return_value = 0
+        mock_sync.return_value = True
+        original_cwd = os.getcwd()
+
+        result = build_and_sync_app(
+            {}, None, bucket_name="bucket", app_path=self.temp_dir, environment="prod"
+        )
+
+        self.assertTrue(result)
+        self.assertEqual(os.getcwd(), original_cwd)
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.args[0], ["npm", "run", "build"])
+        self.assertEqual(mock_run.call_args.kwargs["cwd"], self.app_dir)
+        build_env = mock_run.call_args.kwargs["env"]
+        self.assertEqual(build_env["API_URL"], "https://example.com")
+        mock_sync.assert_called_once_with(
+            self.app_dir / "out",
+            "bucket",
+            accelerate=False,
+            compress=False,
+            on_first_page=None,
+        )
+        self.assertFalse((self.app_dir / ".env.local").exists())
+
+    @patch("npm_build._create_invalidation")
+    @patch("npm_build.sync_directory_to_s3")
+    @patch("npm_build._run_streamed")
+    def test_build_invalidates_during_sync(
+        self, mock_run, mock_sync, mock_create_invalidation
+    ):
+        """Test the invalidation is started from the sync callback."""
+        mock_run.return_value = 0
+        mock_create_invalidation.return_value = "I123"
+
+        def sync(*args, on_first_page=None, **kwargs):
+            on_first_page()
+            return True
+
+        mock_sync.side_effect = sync
+
+        result = build_and_sync_app(
+            {},
+            None,
+            bucket_name="bucket",
+            app_path=self.temp_dir,
+            distribution_id="E123",
+        )
+
+        self.assertTrue(result)
+        mock_create_invalidation.assert_called_once_with("E123", ["/*"])
+
+    @patch("npm_build._run_streamed")
+    def test_build_failure(self, mock_run):
+        """Test a failed npm build stops the hook."""
+        mock_run.return_value = 1
+
+        result = build_and_sync_app(
+            {}, None, bucket_name="bucket", app_path=self.temp_dir
+        )
+
+        self.assertFalse(result)
+
+    @patch("npm_build._run_streamed")
+    def test_missing_output_dir(self, mock_run):
+        """Test the hook fails when the build produced no output directory."""
+        mock_run.return_value = 0
+        (self.app_dir / "out").rmdir()
+
+        result = build_and_sync_app(
+            {}, None, bucket_name="bucket", app_path=self.temp_dir
+        )
+
+        self.assertFalse(result)
+
+    def test_missing_app_dir(self):
+        """Test the hook fails when the app directory does not exist."""
+        result = build_and_sync_app(
+            {}, None, bucket_name="bucket", app_path=f"{self.temp_dir}/missing"
+        )
+
+        self.assertFalse(result)
+
+    def test_missing_bucket_name(self):
+        """Test bucket_name is required."""
+        self.assertFalse(build_and_sync_app({}, None, app_path=self.temp_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,17 +5,39 @@ Unit tests for SAM deploy hook.
 
 import json
 import os
+import re
 import subprocess
 import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, call, patch
 from pathlib import Path
 
 # Add the hooks directory to the path
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from sam_deploy import SAMDeployHook, SAMDeployError, cfngin_hook
+from sam_deploy import (
+    SAMDeployHook,
+    SAMDeployError,
+    _BATCH_STACK_CACHE,
+    _DESCRIBE_CACHE,
+    _build_parser,
+    _cloudformation_config,
+    _confirm,
+    _get_client,
+    _parse_args,
+    _parse_sam_outputs,
+    _sam_cli_version,
+    cfngin_hook,
+    main as sam_deploy_main
+)
+
+
+def _without_ci():
+    """Patch os.environ so the failed-stack check asks for confirmation."""
+    environ = {key: value for key, value in os.environ.items() if key != 'CI'}
+    return patch.dict(os.environ, environ, clear=True)
 
 
 class TestSAMDeployHook(unittest.TestCase):
@@ -23,6 +45,10 @@ class TestSAMDeployHook(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        _get_client.cache_clear()
+        _sam_cli_version.cache_clear()
+        _DESCRIBE_CACHE.clear()
+        _BATCH_STACK_CACHE.clear()
         self.hook = SAMDeployHook()
         self.test_template_content = """
 AWSTemplateFormatVersion: '2010-09-09'
@@ -65,7 +91,20 @@ Outputs:
         client = self.hook._get_cloudformation_client('us-west-2')
         
         self.assertEqual(client, mock_client)
-        mock_boto_client.assert_called_once_with('cloudformation', region_name='us-west-2')
+        mock_boto_client.assert_called_once_with(
+            'cloudformation', region_name='us-west-2', config=_cloudformation_config()
+        )
+        config = mock_boto_client.call_args[1]['config']
+        self.assertEqual(config.retries['mode'], 'adaptive')
+    
+    @patch('boto3.client')
+    def test_get_cloudformation_client_shared(self, mock_boto_client):
+        """Test hook instances share one client per region."""
+        SAMDeployHook()._get_cloudformation_client('us-west-2')
+        SAMDeployHook()._get_cloudformation_client('us-west-2')
+        SAMDeployHook()._get_cloudformation_client('eu-west-1')
+        
+        self.assertEqual(mock_boto_client.call_count, 2)
     
     @patch('boto3.client')
     def test_get_cloudformation_client_no_credentials(self, mock_boto_client):
@@ -96,6 +135,17 @@ Outputs:
             timeout=10
         )
     
+    @patch('subprocess.run')
+    def test_check_sam_cli_cached(self, mock_run):
+        """Test the SAM CLI is probed once across hook instances."""
+        mock_run.return_value = Mock(returncode=0, stdout="SAM CLI, version 1.100.0")
+        
+        self.assertTrue(self.hook._check_sam_cli())
+        self.assertTrue(SAMDeployHook()._check_sam_cli())
+        
+        mock_run.assert_called_once()
+        self.assertEqual(_sam_cli_version(), "SAM CLI, version 1.100.0")
+    
     @patch('subprocess.run')
     def test_check_sam_cli_failure(self, mock_run):
         """Test failed SAM CLI check."""
@@ -117,6 +167,25 @@ Outputs:
         
         self.assertFalse(result)
     
+    def test_run_streamed(self):
+        """Test SAM CLI output is streamed and its tail kept as the result."""
+        cmd = [sys.executable, '-c', "import sys; print('out'); print('err', file=sys.stderr)"]
+        
+        with self.assertLogs('sam_deploy', level='INFO') as logs:
+            result = self.hook._run_streamed(cmd, timeout=30)
+        
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(sorted(result.stdout.splitlines()), ['err', 'out'])
+        self.assertEqual(result.stderr, '')
+        self.assertTrue(any(line.endswith(':out') for line in logs.output))
+    
+    def test_run_streamed_timeout(self):
+        """Test a command that outlives its timeout is killed."""
+        cmd = [sys.executable, '-c', 'import time; time.sleep(30)']
+        
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.hook._run_streamed(cmd, timeout=0.5)
+    
     def test_build_sam_command_basic(self):
         """Test building basic SAM command."""
         cmd = self.hook._build_sam_command(
@@ -137,6 +206,47 @@ Outputs:
         
         self.assertEqual(cmd, expected)
     
+    def test_build_sam_command_quotes_overrides(self):
+        """Test override values SAM would split or misparse are double-quoted."""
+        cmd = self.hook._build_sam_command(
+            template_file='template.yaml',
+            stack_name='test-stack',
+            parameters={'Name': 'my app', 'Quote': 'say "hi"', 'Empty': '', 'Port': 8080}
+        )
+        
+        overrides = cmd[cmd.index('--parameter-overrides') + 1]
+        self.assertEqual(overrides, 'Name="my app" Quote="say \\"hi\\"" Empty="" Port=8080')
+    
+    def test_build_sam_command_overrides_round_trip(self):
+        """Test backslashes and quotes survive SAM's parameter override parsing."""
+        parameters = {'Path': 'C:\\app\\bin', 'Message': 'say "C:\\tmp" now', 'Plain': 'x'}
+        cmd = self.hook._build_sam_command(
+            template_file='template.yaml',
+            stack_name='test-stack',
+            parameters=parameters
+        )
+        
+        # Mirrors the SAM CLI's override parsing: split on unquoted spaces,
+        # strip surrounding quotes and unescape only \" and escaped spaces
+        overrides = cmd[cmd.index('--parameter-overrides') + 1]
+        parsed = {}
+        for match in re.finditer(r'(\w+)=("(?:\\.|[^"\\])*"|\S+)', overrides):
+            value = match.group(2)
+            if value[0] == value[-1] == '"':
+                value = value[1:-1]
+            parsed[match.group(1)] = value.replace('\\ ', ' ').replace('\\"', '"')
+        
+        self.assertEqual(parsed, parameters)
+    
+    def test_build_sam_command_returns_fresh_list(self):
+        """Test repeated builds share the cached command but not the list."""
+        first = self.hook._build_sam_command(template_file='template.yaml', stack_name='test-stack')
+        first.append('--guided')
+        second = self.hook._build_sam_command(template_file='template.yaml', stack_name='test-stack')
+        
+        self.assertNotIn('--guided', second)
+        self.assertEqual(first[:-1], second)
+    
     def test_build_sam_command_full(self):
         """Test building full SAM command with all options."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
@@ -164,7 +274,7 @@ Outputs:
                 '--region', 'us-west-2',
                 '--config-file', config_file,
                 '--config-env', 'dev',
-                '--parameter-overrides', 'Environment=dev', 'BucketName=test-bucket',
+                '--parameter-overrides', 'Environment=dev BucketName=test-bucket',
                 '--capabilities', 'CAPABILITY_IAM',
                 '--guided',
                 '--no-confirm-changeset',
@@ -175,7 +285,7 @@ Outputs:
         finally:
             os.unlink(config_file)
     
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     def test_deploy_sam_template_success(self, mock_check_sam, mock_run):
         """Test successful SAM template deployment."""
@@ -206,7 +316,7 @@ Outputs:
         finally:
             os.unlink(template_file)
     
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     def test_deploy_sam_template_failure(self, mock_check_sam, mock_run):
         """Test failed SAM template deployment."""
@@ -242,7 +352,7 @@ Outputs:
         finally:
             os.unlink(template_file)
     
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     def test_deploy_sam_template_no_changes(self, mock_check_sam, mock_run):
         """Test deployment when there are no changes to deploy (should be treated as success)."""
@@ -305,7 +415,7 @@ Outputs:
         
         self.assertIn("SAM template file not found", str(context.exception))
     
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     def test_deploy_sam_template_timeout(self, mock_check_sam, mock_run):
         """Test deployment timeout."""
@@ -329,7 +439,7 @@ Outputs:
         finally:
             os.unlink(template_file)
     
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     @patch.object(SAMDeployHook, '_get_cloudformation_client')
     def test_deploy_sam_template_with_wait(self, mock_get_cf_client, mock_check_sam, mock_run):
@@ -372,9 +482,210 @@ Outputs:
             self.assertEqual(result['stack_info']['Outputs']['TestOutput'], 'test-value')
         finally:
             os.unlink(template_file)
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_get_cloudformation_client')
+    def test_deploy_sam_template_build_overlaps_stack_check(self, mock_get_cf_client,
+                                                            mock_check_sam, mock_run):
+        """Test in CI the failed-stack check runs while the template builds."""
+        mock_run.return_value = Mock(returncode=0, stdout="Successfully deployed", stderr="")
+        mock_get_cf_client.return_value.describe_stacks.return_value = {'Stacks': []}
+        build_started = threading.Event()
+        overlapped = []
+        
+        def check(stack_name, region):
+            overlapped.append(build_started.wait(timeout=5))
+            return False
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(self.test_template_content)
+            template_file = f.name
+        
+        try:
+            with patch.dict(os.environ, {'CI': '1'}), \
+                    patch.object(SAMDeployHook, '_check_and_handle_failed_stack', side_effect=check), \
+                    patch.object(SAMDeployHook, '_run_sam_build',
+                                 side_effect=lambda *args: build_started.set()):
+                result = self.hook.deploy_sam_template(
+                    template_file=template_file,
+                    stack_name='test-stack'
+                )
+        finally:
+            os.unlink(template_file)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(overlapped, [True])
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_check_and_handle_failed_stack', return_value=False)
+    def test_deploy_sam_template_param_file(self, mock_check_failed, mock_check_sam, mock_run):
+        """Test parameter file values are merged under inline parameters."""
+        mock_run.return_value = Mock(returncode=0, stdout="Successfully deployed", stderr="")
+        
+        with tempfile.TemporaryDirectory() as working_directory:
+            Path(working_directory, 'template.yaml').write_text(self.test_template_content)
+            Path(working_directory, 'parameters.json').write_text(
+                json.dumps({'Environment': 'dev', 'BucketName': 'file-bucket'})
+            )
+            Path(working_directory, 'invalid.json').write_text('{"Environment": ')
+            
+            self.hook.deploy_sam_template(
+                template_file='template.yaml',
+                stack_name='test-stack',
+                parameters={'Environment': 'prod'},
+                param_file='parameters.json',
+                wait=False,
+                working_directory=working_directory,
+                skip_build=True
+            )
+            
+            with self.assertRaises(SAMDeployError) as context:
+                self.hook.deploy_sam_template(
+                    template_file='template.yaml',
+                    stack_name='test-stack',
+                    param_file='invalid.json',
+                    working_directory=working_directory
+                )
+        
+        deploy_cmd = mock_run.call_args[0][0]
+        overrides = deploy_cmd[deploy_cmd.index('--parameter-overrides') + 1]
+        self.assertEqual(overrides, 'Environment=prod BucketName=file-bucket')
+        self.assertIn("Invalid JSON in parameter file", str(context.exception))
+        
+        with tempfile.TemporaryDirectory() as working_directory:
+            with self.assertRaises(SAMDeployError) as context:
+                self.hook.deploy_sam_template(
+                    template_file='template.yaml',
+                    stack_name='test-stack',
+                    param_file='missing.json',
+                    working_directory=working_directory
+                )
+        self.assertIn("Parameter file not found", str(context.exception))
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_check_and_handle_failed_stack', return_value=False)
+    def test_deploy_sam_template_working_directory(self, mock_check_failed, mock_check_sam,
+                                                   mock_run):
+        """Test SAM commands run in the working directory without chdir."""
+        mock_run.return_value = Mock(returncode=0, stdout="Successfully deployed", stderr="")
+        original_cwd = os.getcwd()
+        
+        with tempfile.TemporaryDirectory() as working_directory:
+            Path(working_directory, 'template.yaml').write_text(self.test_template_content)
+            with patch('os.chdir') as mock_chdir:
+                self.hook.deploy_sam_template(
+                    template_file='template.yaml',
+                    stack_name='test-stack',
+                    wait=False,
+                    working_directory=working_directory
+                )
+        
+        mock_chdir.assert_not_called()
+        self.assertEqual(os.getcwd(), original_cwd)
+        self.assertEqual(mock_run.call_count, 2)
+        for call in mock_run.call_args_list:
+            self.assertEqual(call[0][2], working_directory)
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_check_and_handle_failed_stack', return_value=False)
+    @patch.object(SAMDeployHook, '_get_cloudformation_client')
+    def test_deploy_sam_template_outputs_from_sam(self, mock_get_cf_client, mock_check_failed,
+                                                  mock_check_sam, mock_run):
+        """Test outputs printed by sam deploy are used without describing the stack."""
+        mock_run.return_value = Mock(returncode=0, stderr="", stdout=(
+            "CloudFormation events from stack operations\n"
+            "ResourceStatus      ResourceType                 LogicalResourceId\n"
+            "UPDATE_IN_PROGRESS  AWS::CloudFormation::Stack   test-stack\n"
+            "UPDATE_COMPLETE     AWS::CloudFormation::Stack   test-stack\n"
+            "CloudFormation outputs from deployed stack\n"
+            "----------------------------------------------------------------\n"
+            "Outputs\n"
+            "----------------------------------------------------------------\n"
+            "Key                 ApiUrl\n"
+            "Description         API Gateway endpoint URL for the Prod stage\n"
+            "                    of the function\n"
+            "Value               https://example.com/Prod/\n"
+            "\n"
+            "Key                 FunctionArn\n"
+            "Description         Function ARN\n"
+            "Value               arn:aws:lambda:us-east-1:123456789012:function:fn\n"
+            "----------------------------------------------------------------\n"
+            "Successfully created/updated stack - test-stack in us-east-1\n"
+        ))
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(self.test_template_content)
+            template_file = f.name
+        
+        try:
+            result = self.hook.deploy_sam_template(
+                template_file=template_file,
+                stack_name='test-stack',
+                skip_build=True
+            )
+        finally:
+            os.unlink(template_file)
+        
+        self.assertNotIn('StackId', result['stack_info'])
+        self.assertEqual(result['stack_info']['StackStatus'], 'UPDATE_COMPLETE')
+        self.assertEqual(result['stack_info']['Outputs'], {
+            'ApiUrl': 'https://example.com/Prod/',
+            'FunctionArn': 'arn:aws:lambda:us-east-1:123456789012:function:fn'
+        })
+        mock_get_cf_client.assert_not_called()
+    
+    def test_parse_sam_outputs_wrapped_value(self):
+        """Test a wrapped output value yields nothing, so the stack is described instead."""
+        stdout = (
+            "Outputs\n"
+            "-------\n"
+            "Key                 LongValue\n"
+            "Value               first-half-of-a-very-long-\n"
+            "                    value\n"
+            "-------\n"
+        )
+        self.assertEqual(_parse_sam_outputs(stdout), {})
+        self.assertEqual(_parse_sam_outputs("Successfully deployed"), {})
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_get_cloudformation_client')
+    def test_deploy_sam_template_no_changes_reuses_describe(self, mock_get_cf_client,
+                                                            mock_check_sam, mock_run):
+        """Test an unchanged stack is described once for the check and the outputs."""
+        mock_run.return_value = Mock(
+            returncode=0,
+            stdout="No changes to deploy. Stack test-stack is up to date",
+            stderr=""
+        )
+        mock_cf_client = Mock()
+        mock_cf_client.describe_stacks.return_value = {
+            'Stacks': [{'StackName': 'test-stack', 'StackStatus': 'UPDATE_COMPLETE'}]
+        }
+        mock_get_cf_client.return_value = mock_cf_client
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(self.test_template_content)
+            template_file = f.name
+        
+        try:
+            result = self.hook.deploy_sam_template(
+                template_file=template_file,
+                stack_name='test-stack'
+            )
+        finally:
+            os.unlink(template_file)
+        
+        self.assertEqual(result['stack_info']['StackStatus'], 'UPDATE_COMPLETE')
+        mock_cf_client.describe_stacks.assert_called_once_with(StackName='test-stack')
 
-    @patch('sam_deploy.boto3.client')
-    def test_check_and_handle_failed_stack_rollback_complete(self, mock_boto3_client):
+    @patch('sam_deploy._confirm', return_value=True)
+    @patch('boto3.client')
+    def test_check_and_handle_failed_stack_rollback_complete(self, mock_boto3_client, mock_confirm):
         """Test handling of ROLLBACK_COMPLETE stack."""
         # Mock CloudFormation client
         mock_cf_client = Mock()
@@ -392,16 +703,19 @@ Outputs:
         mock_waiter = Mock()
         mock_cf_client.get_waiter.return_value = mock_waiter
         
-        result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
+        with _without_ci(), patch('builtins.print'):
+            result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
         
-        # Verify stack was deleted
+        # Verify stack was deleted after confirmation
+        mock_confirm.assert_called_once()
         mock_cf_client.delete_stack.assert_called_once_with(StackName='test-stack')
         mock_cf_client.get_waiter.assert_called_once_with('stack_delete_complete')
         mock_waiter.wait.assert_called_once()
         self.assertTrue(result)
     
-    @patch('sam_deploy.boto3.client')
-    def test_check_and_handle_failed_stack_create_failed(self, mock_boto3_client):
+    @patch('sam_deploy._confirm', return_value=True)
+    @patch('boto3.client')
+    def test_check_and_handle_failed_stack_create_failed(self, mock_boto3_client, mock_confirm):
         """Test handling of CREATE_FAILED stack."""
         # Mock CloudFormation client
         mock_cf_client = Mock()
@@ -419,13 +733,15 @@ Outputs:
         mock_waiter = Mock()
         mock_cf_client.get_waiter.return_value = mock_waiter
         
-        result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
+        with _without_ci(), patch('builtins.print'):
+            result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
         
-        # Verify stack was deleted
+        # Verify stack was deleted after confirmation
+        mock_confirm.assert_called_once()
         mock_cf_client.delete_stack.assert_called_once_with(StackName='test-stack')
         self.assertTrue(result)
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_check_and_handle_failed_stack_healthy_state(self, mock_boto3_client):
         """Test handling of healthy stack state."""
         # Mock CloudFormation client
@@ -446,7 +762,7 @@ Outputs:
         mock_cf_client.delete_stack.assert_not_called()
         self.assertFalse(result)
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_check_and_handle_failed_stack_does_not_exist(self, mock_boto3_client):
         """Test handling of non-existent stack."""
         # Mock CloudFormation client
@@ -469,8 +785,140 @@ Outputs:
         mock_cf_client.delete_stack.assert_not_called()
         self.assertTrue(result)
     
-    @patch('sam_deploy.boto3.client')
-    def test_check_and_handle_failed_stack_deletion_timeout(self, mock_boto3_client):
+    @patch('boto3.client')
+    def test_stack_status(self, mock_boto3_client):
+        """Test stack status lookup for existing and missing stacks."""
+        from botocore.exceptions import ClientError
+        mock_cf_client = Mock()
+        mock_boto3_client.return_value = mock_cf_client
+        mock_cf_client.describe_stacks.side_effect = [
+            {'Stacks': [{'StackName': 'test-stack', 'StackStatus': 'CREATE_COMPLETE'}]},
+            ClientError(
+                {'Error': {'Code': 'ValidationError',
+                           'Message': 'Stack with id missing-stack does not exist'}},
+                'DescribeStacks'
+            ),
+            ClientError({'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}},
+                        'DescribeStacks')
+        ]
+        
+        self.assertEqual(self.hook._stack_status('test-stack'), 'CREATE_COMPLETE')
+        self.assertIsNone(self.hook._stack_status('missing-stack'))
+        with self.assertRaises(ClientError):
+            self.hook._stack_status('other-stack')
+    
+    @patch('boto3.client')
+    def test_batch_describe_shares_one_call(self, mock_boto3_client):
+        """Test batch-describing hooks share one account-wide describe_stacks call."""
+        from botocore.exceptions import ClientError
+        mock_cf_client = Mock()
+        mock_boto3_client.return_value = mock_cf_client
+        
+        def describe_stacks(**kwargs):
+            if 'StackName' not in kwargs:
+                return {'Stacks': [
+                    {'StackName': 'stack-a', 'StackStatus': 'CREATE_COMPLETE'},
+                    {'StackName': 'stack-b', 'StackStatus': 'ROLLBACK_COMPLETE'}
+                ]}
+            raise ClientError(
+                {'Error': {'Code': 'ValidationError',
+                           'Message': f"Stack with id {kwargs['StackName']} does not exist"}},
+                'DescribeStacks'
+            )
+        
+        mock_cf_client.describe_stacks.side_effect = describe_stacks
+        
+        self.assertEqual(SAMDeployHook(batch_describe=True)._stack_status('stack-a'),
+                         'CREATE_COMPLETE')
+        self.assertEqual(SAMDeployHook(batch_describe=True)._stack_status('stack-b'),
+                         'ROLLBACK_COMPLETE')
+        self.assertIsNone(SAMDeployHook(batch_describe=True)._stack_status('stack-c'))
+        
+        self.assertEqual(mock_cf_client.describe_stacks.call_count, 2)
+        mock_cf_client.describe_stacks.assert_any_call()
+        mock_cf_client.describe_stacks.assert_any_call(StackName='stack-c')
+    
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch('boto3.client')
+    def test_batch_describe_reads_outputs_by_name(self, mock_boto3_client, mock_check_sam,
+                                                  mock_run):
+        """Test a batch-describing deploy reads its outputs without a new batch."""
+        mock_run.return_value = Mock(returncode=0, stdout="Successfully deployed", stderr="")
+        mock_cf_client = Mock()
+        mock_boto3_client.return_value = mock_cf_client
+        mock_cf_client.describe_stacks.return_value = {
+            'Stacks': [{'StackName': 'test-stack', 'StackStatus': 'UPDATE_COMPLETE'}]
+        }
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(self.test_template_content)
+            template_file = f.name
+        
+        try:
+            SAMDeployHook(batch_describe=True).deploy_sam_template(
+                template_file=template_file,
+                stack_name='test-stack',
+                skip_build=True
+            )
+        finally:
+            os.unlink(template_file)
+        
+        self.assertEqual(mock_cf_client.describe_stacks.call_args_list,
+                         [call(), call(StackName='test-stack')])
+    
+    def test_confirm(self):
+        """Test the deletion prompt reads answers from a terminal and gives up on silence."""
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd) as stdin, os.fdopen(write_fd, 'w') as writer:
+            stdin.isatty = lambda: True
+            with patch('sys.stdin', stdin), patch('builtins.print') as mock_print:
+                writer.write("y\n")
+                writer.flush()
+                self.assertTrue(_confirm("Delete?"))
+                self.assertFalse(_confirm("Delete?", timeout=0.05))
+                
+                writer.write("maybe\n")
+                writer.close()
+                self.assertFalse(_confirm("Delete?"))
+                mock_print.assert_any_call("Please enter 'y' for yes or 'n' for no.")
+        
+        with patch('sys.stdin') as mock_stdin:
+            mock_stdin.isatty.return_value = False
+            self.assertFalse(_confirm("Delete?"))
+            mock_stdin.readline.assert_not_called()
+    
+    @patch('sam_deploy.select.select', side_effect=OSError("not a socket"))
+    def test_confirm_windows(self, mock_select):
+        """Test the prompt reads stdin without select() on Windows."""
+        with patch('sam_deploy.os.name', 'nt'), patch('sys.stdin') as mock_stdin, \
+                patch('builtins.print'):
+            mock_stdin.isatty.return_value = True
+            mock_stdin.readline.side_effect = ["maybe\n", "yes\n"]
+            self.assertTrue(_confirm("Delete?"))
+        
+        mock_select.assert_not_called()
+    
+    @patch('boto3.client')
+    def test_check_and_handle_failed_stack_not_a_terminal(self, mock_boto3_client):
+        """Test a failed stack is kept when stdin is not a terminal outside CI."""
+        mock_cf_client = Mock()
+        mock_boto3_client.return_value = mock_cf_client
+        mock_cf_client.describe_stacks.return_value = {
+            'Stacks': [{'StackName': 'test-stack', 'StackStatus': 'ROLLBACK_COMPLETE'}]
+        }
+        
+        with _without_ci(), patch('sys.stdin') as mock_stdin, patch('builtins.print'):
+            mock_stdin.isatty.return_value = False
+            with self.assertRaises(SAMDeployError) as context:
+                self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
+        
+        self.assertIn("deletion was not confirmed", str(context.exception))
+        mock_cf_client.delete_stack.assert_not_called()
+    
+    @patch('sam_deploy._confirm', return_value=True)
+    @patch('boto3.client')
+    def test_check_and_handle_failed_stack_deletion_timeout(self, mock_boto3_client, mock_confirm):
         """Test handling of stack deletion timeout."""
         # Mock CloudFormation client
         mock_cf_client = Mock()
@@ -489,13 +937,15 @@ Outputs:
         mock_waiter.wait.side_effect = Exception("Waiter timeout")
         mock_cf_client.get_waiter.return_value = mock_waiter
         
-        with self.assertRaises(SAMDeployError) as context:
-            self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
+        with _without_ci(), patch('builtins.print'):
+            with self.assertRaises(SAMDeployError) as context:
+                self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
         
         self.assertIn("Stack deletion failed", str(context.exception))
     
-    @patch('sam_deploy.boto3.client')
-    def test_check_and_handle_failed_stack_all_failed_states(self, mock_boto3_client):
+    @patch('sam_deploy._confirm', return_value=True)
+    @patch('boto3.client')
+    def test_check_and_handle_failed_stack_all_failed_states(self, mock_boto3_client, mock_confirm):
         """Test all failed states are handled correctly."""
         # Mock CloudFormation client
         mock_cf_client = Mock()
@@ -527,13 +977,14 @@ Outputs:
                     }]
                 }
                 
-                result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
+                with _without_ci(), patch('builtins.print'):
+                    result = self.hook._check_and_handle_failed_stack('test-stack', 'us-east-1')
                 
                 # Verify stack was deleted for all failed states
                 mock_cf_client.delete_stack.assert_called_once_with(StackName='test-stack')
                 self.assertTrue(result)
 
-    @patch('subprocess.run')
+    @patch.object(SAMDeployHook, '_run_streamed')
     @patch.object(SAMDeployHook, '_check_sam_cli')
     @patch.object(SAMDeployHook, '_check_and_handle_failed_stack')
     def test_deploy_sam_template_with_failed_stack_check(self, mock_check_failed, mock_check_sam, mock_run):
@@ -568,7 +1019,39 @@ Outputs:
         finally:
             os.unlink(template_file)
 
-    @patch('sam_deploy.boto3.client')
+    @patch.object(SAMDeployHook, '_run_streamed')
+    @patch.object(SAMDeployHook, '_check_sam_cli', return_value=True)
+    @patch.object(SAMDeployHook, '_check_and_handle_failed_stack')
+    def test_deploy_sam_template_skip_failed_stack_check(self, mock_check_failed,
+                                                         mock_check_sam, mock_run):
+        """Test the failed-stack check is skipped only on request."""
+        mock_run.return_value = Mock(returncode=0, stdout="Successfully deployed", stderr="")
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(self.test_template_content)
+            template_file = f.name
+        
+        try:
+            self.hook.deploy_sam_template(
+                template_file=template_file,
+                stack_name='test-stack',
+                wait=False,
+                skip_build=True,
+                skip_failed_stack_check=True
+            )
+            mock_check_failed.assert_not_called()
+            
+            self.hook.deploy_sam_template(
+                template_file=template_file,
+                stack_name='test-stack',
+                wait=False,
+                skip_build=True
+            )
+            mock_check_failed.assert_called_once_with('test-stack', 'us-east-1')
+        finally:
+            os.unlink(template_file)
+
+    @patch('boto3.client')
     def test_delete_sam_stack_success(self, mock_boto3_client):
         """Test successful stack deletion."""
         # Mock CloudFormation client
@@ -594,11 +1077,15 @@ Outputs:
         mock_cf_client.get_waiter.assert_called_once_with('stack_delete_complete')
         mock_waiter.wait.assert_called_once()
         
+        # The waiter polls every SAM_POLL_DELAY seconds for the whole timeout
+        waiter_config = mock_waiter.wait.call_args[1]['WaiterConfig']
+        self.assertEqual(waiter_config['Delay'] * waiter_config['MaxAttempts'], 1800)
+        
         self.assertTrue(result['success'])
         self.assertEqual(result['stack_name'], 'test-stack')
         self.assertEqual(result['region'], 'us-east-1')
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_does_not_exist(self, mock_boto3_client):
         """Test deletion of non-existent stack."""
         # Mock CloudFormation client
@@ -623,7 +1110,7 @@ Outputs:
         self.assertTrue(result['success'])
         self.assertEqual(result['message'], 'Stack does not exist')
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_already_deleted(self, mock_boto3_client):
         """Test deletion of already deleted stack."""
         # Mock CloudFormation client
@@ -646,7 +1133,7 @@ Outputs:
         self.assertTrue(result['success'])
         self.assertEqual(result['message'], 'Stack already deleted')
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_deletion_in_progress(self, mock_boto3_client):
         """Test deletion when stack is already being deleted."""
         # Mock CloudFormation client
@@ -674,7 +1161,7 @@ Outputs:
         self.assertTrue(result['success'])
         self.assertEqual(result['message'], 'Stack deletion already in progress')
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_with_retain_resources(self, mock_boto3_client):
         """Test stack deletion with resource retention."""
         # Mock CloudFormation client
@@ -708,7 +1195,7 @@ Outputs:
         
         self.assertTrue(result['success'])
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_no_wait(self, mock_boto3_client):
         """Test stack deletion without waiting."""
         # Mock CloudFormation client
@@ -732,7 +1219,7 @@ Outputs:
         self.assertTrue(result['success'])
         self.assertEqual(result['message'], 'Stack deletion initiated')
     
-    @patch('sam_deploy.boto3.client')
+    @patch('boto3.client')
     def test_delete_sam_stack_waiter_timeout(self, mock_boto3_client):
         """Test stack deletion with waiter timeout."""
         # Mock CloudFormation client
@@ -847,7 +1334,8 @@ class TestCFNginHook(unittest.TestCase):
             timeout=1200,
             working_directory='/tmp',
             skip_build=False,
-            resolve_image_repos=True
+            resolve_image_repos=True,
+            skip_failed_stack_check=False
         )
 
 
@@ -939,6 +1427,81 @@ class TestCFNginDeleteHook(unittest.TestCase):
             )
 
 
+class TestCommandLine(unittest.TestCase):
+    """Test cases for the command line parsers."""
+    
+    @patch('sam_deploy.SAMDeployHook')
+    def test_main_passes_options_to_deploy(self, mock_hook_class):
+        """Test main() maps the deploy options onto deploy_sam_template."""
+        mock_hook_class.return_value.deploy_sam_template.return_value = {
+            'stack_name': 'test-stack', 'region': 'us-west-2', 'stack_info': {}
+        }
+        argv = ['sam_deploy.py', 'deploy', '--template', 'template.yaml',
+                '--stack-name', 'test-stack', '--region', 'us-west-2',
+                '--parameters', 'Environment=dev', 'bad', '--no-wait', '--skip-stack-check']
+        
+        with patch.object(sys, 'argv', argv), patch('builtins.print'):
+            self.assertEqual(sam_deploy_main(), 0)
+        
+        mock_hook_class.return_value.deploy_sam_template.assert_called_once_with(
+            template_file='template.yaml',
+            stack_name='test-stack',
+            config_file=None,
+            env=None,
+            parameters={'Environment': 'dev'},
+            param_file=None,
+            capabilities=None,
+            region='us-west-2',
+            wait=False,
+            timeout=1800,
+            working_directory=None,
+            skip_build=False,
+            skip_failed_stack_check=True
+        )
+    
+    @patch('sam_deploy.SAMDeployHook')
+    def test_main_passes_options_to_delete(self, mock_hook_class):
+        """Test main() maps the delete options onto delete_sam_stack."""
+        mock_hook_class.return_value.delete_sam_stack.return_value = {
+            'stack_name': 'test-stack', 'region': 'us-east-1', 'message': 'deleted'
+        }
+        argv = ['sam_deploy.py', 'delete', '--stack-name', 'test-stack',
+                '--retain-resources', 'Bucket']
+        
+        with patch.object(sys, 'argv', argv), patch('builtins.print'):
+            self.assertEqual(sam_deploy_main(), 0)
+        
+        mock_hook_class.return_value.delete_sam_stack.assert_called_once_with(
+            stack_name='test-stack',
+            region='us-east-1',
+            wait=True,
+            timeout=1800,
+            retain_resources=['Bucket']
+        )
+    
+    def test_parser_is_built_once(self):
+        """Test the parsers are cached across calls."""
+        self.assertIs(_build_parser(), _build_parser())
+    
+    def test_parser_without_command(self):
+        """Test a bare invocation parses to no command rather than failing."""
+        args = _build_parser().parse_args([])
+        
+        self.assertIsNone(args.command)
+        self.assertFalse(args.verbose)
+    
+    def test_legacy_arguments_parse_as_deploy(self):
+        """Test arguments without a subcommand parse as a deploy."""
+        argv = ['--template', 'template.yaml', '--stack-name', 'test-stack',
+                '--parameters', 'Environment=dev', '--skip-build', '--skip-stack-check', '-v']
+        
+        self.assertEqual(_parse_args(argv), _parse_args(['deploy'] + argv))
+        self.assertEqual(_parse_args(argv).command, 'deploy')
+        self.assertEqual(_parse_args(argv).template_file, 'template.yaml')
+        self.assertTrue(_parse_args(argv).skip_failed_stack_check)
+        self.assertEqual(_parse_args(['delete', '--stack-name', 'test-stack']).command, 'delete')
+
+
 if __name__ == '__main__':
     # Run tests
     unittest.main(verbosity=2)
@@ -6,11 +6,53 @@ This script validates that the Docker Compose hooks are properly configured
 and can be imported and executed.
 """
 
+import contextlib
+import functools
+import io
 import os
+import re
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    # libyaml's parser, when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# "docker_compose_enabled: <value>" line in an environment file
+DOCKER_COMPOSE_ENABLED_RE = re.compile(rb'^[ \t]*docker_compose_enabled:([^\r\n]*)', re.M)
+
+# Services docker-compose.yml is expected to define
+EXPECTED_SERVICES = frozenset([
+    'api-public', 'api-internal', 'registration-site',
+    'internal-site', 'sales-dashboard', 'scanner-service',
+    'worker-service', 'report-service'
+])
+
+def find_docker_compose_enabled(content):
+    """Return the raw docker_compose_enabled value in an env file, or None."""
+    # bytes.find locates the key at C speed; the anchored regex only runs
+    # from the start of the line where it first appears
+    index = content.find(b'docker_compose_enabled:')
+    if index < 0:
+        return None
+    match = DOCKER_COMPOSE_ENABLED_RE.search(content, content.rfind(b'\n', 0, index) + 1)
+    return match.group(1) if match else None
+
+@functools.lru_cache(maxsize=None)
+def _load_yaml_cached(path, mtime_ns):
+    """Parse a YAML file; the mtime in the key drops stale entries on edit."""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def load_yaml(path):
+    """Parse a YAML file, reusing the result until the file changes."""
+    path = Path(path)
+    return _load_yaml_cached(str(path), path.stat().st_mtime_ns)
+
 def validate_hook_imports():
     """Validate that hook functions can be imported."""
     print("🔍 Validating hook imports...")
@@ -44,8 +86,7 @@ def validate_stacks_configuration():
         return False
     
     try:
-        with open(stacks_file, 'r') as f:
-            stacks_config = yaml.safe_load(f)
+        stacks_config = load_yaml(stacks_file)
         
         # Check for pre_deploy hooks
         pre_deploy = stacks_config.get('pre_deploy', [])
@@ -119,35 +160,30 @@ def validate_environment_files():
     
     all_valid = True
     
-    for env_file, expected_enabled in env_files:
-        env_path = Path(env_file)
-        
-        if not env_path.exists():
-            print(f"❌ Environment file not found: {env_file}")
-            all_valid = False
-            continue
-        
+    # Read the files concurrently; report on them in order below
+    with ThreadPoolExecutor(max_workers=len(env_files)) as executor:
+        reads = [executor.submit(Path(env_file).read_bytes) for env_file, _ in env_files]
+    
+    for (env_file, expected_enabled), read in zip(env_files, reads):
         try:
-            with open(env_path, 'r') as f:
-                content = f.read()
-            
             # Check for docker_compose_enabled variable
-            if 'docker_compose_enabled:' in content:
+            raw_value = find_docker_compose_enabled(read.result())
+            if raw_value is not None:
                 # Extract the value
-                for line in content.split('\n'):
-                    if line.strip().startswith('docker_compose_enabled:'):
-                        value = line.split(':', 1)[1].strip().lower()
-                        expected_value = 'true' if expected_enabled else 'false'
-                        
-                        if value == expected_value:
-                            print(f"✅ {env_file}: docker_compose_enabled = {value} (correct)")
-                        else:
-                            print(f"⚠️  {env_file}: docker_compose_enabled = {value} (expected {expected_value})")
-                        break
+                value = raw_value.decode().strip().lower()
+                expected_value = 'true' if expected_enabled else 'false'
+                
+                if value == expected_value:
+                    print(f"✅ {env_file}: docker_compose_enabled = {value} (correct)")
+                else:
+                    print(f"⚠️  {env_file}: docker_compose_enabled = {value} (expected {expected_value})")
             else:
                 print(f"❌ {env_file}: docker_compose_enabled variable not found")
                 all_valid = False
                 
+        except FileNotFoundError:
+            print(f"❌ Environment file not found: {env_file}")
+            all_valid = False
         except Exception as e:
             print(f"❌ Error reading {env_file}: {e}")
             all_valid = False
@@ -165,29 +201,19 @@ def validate_docker_compose_file():
         return False
     
     try:
-        with open(compose_file, 'r') as f:
-            compose_config = yaml.safe_load(f)
+        compose_config = load_yaml(compose_file)
         
         services = compose_config.get('services', {})
-        expected_services = [
-            'api-public', 'api-internal', 'registration-site', 
-            'internal-site', 'sales-dashboard', 'scanner-service', 
-            'worker-service', 'report-service'
-        ]
-        
-        found_services = []
-        missing_services = []
-        
-        for service in expected_services:
-            if service in services:
-                found_services.append(service)
-                print(f"✅ Found service: {service}")
-            else:
-                missing_services.append(service)
-                print(f"⚠️  Missing service: {service}")
+        found_services = EXPECTED_SERVICES & services.keys()
+        missing_services = EXPECTED_SERVICES - found_services
+        
+        for service in sorted(found_services):
+            print(f"✅ Found service: {service}")
+        for service in sorted(missing_services):
+            print(f"⚠️  Missing service: {service}")
         
         if missing_services:
-            print(f"⚠️  Some expected services are missing: {missing_services}")
+            print(f"⚠️  Some expected services are missing: {sorted(missing_services)}")
         else:
             print("✅ All expected services found in docker-compose.yml")
         
@@ -200,8 +226,8 @@ def validate_docker_compose_file():
         print(f"❌ Unexpected error validating docker-compose.yml: {e}")
         return False
 
-def main():
-    """Run all validations."""
+def run_validations():
+    """Run all validations, printing a report; returns the exit code."""
     print("🚀 Validating Docker Compose integration hooks...\n")
     
     validations = [
@@ -214,6 +240,11 @@ def main():
     results = []
     
     for name, validation_func in validations:
+        # The other checks are moot when the hooks cannot even be imported
+        if results and not results[0][1]:
+            results.append((name, None))
+            continue
+        
         print(f"\n{'='*50}")
         print(f"Validating: {name}")
         print('='*50)
@@ -232,7 +263,10 @@ def main():
     
     all_passed = True
     for name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
+        if result is None:
+            status = "⏭️  SKIPPED (hook imports failed)"
+        else:
+            status = "✅ PASS" if result else "❌ FAIL"
         print(f"{name}: {status}")
         if not result:
             all_passed = False
@@ -245,5 +279,15 @@ def main():
         print("⚠️  Some validations failed. Please review the issues above.")
         return 1
 
+def main():
+    """Run all validations, writing the report to stdout in one go."""
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return run_validations()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
 if __name__ == '__main__':
     exit(main())
\ No newline at end of file
@@ -6,20 +6,22 @@ This hook can be called from Runway to invalidate CloudFront distributions.
 """
 
 import argparse
+import functools
 import logging
 import os
 import sys
 import time
-from typing import Any, Dict, Optional
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
-from dotenv import load_dotenv
+logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Seconds between invalidation status checks while waiting
+POLL_DELAY = 5
 
-logger = logging.getLogger(__name__)
+# Upper bound on distributions invalidated at the same time
+MAX_WORKERS = 16
 
 
 class CloudFrontInvalidationError(Exception):
@@ -28,6 +30,32 @@ class CloudFrontInvalidationError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _ensure_env_loaded() -> None:
+    """Load .env into the environment once, on the first hook or CLI call."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client() -> Any:
+    """
+    Get the process-wide CloudFront client.
+
+    CloudFront is a global service, so one client serves every distribution
+    and repeated hook calls skip loading the service model again. boto3 is
+    imported here rather than at module load, so importing the hook to
+    validate or inspect it stays fast.
+
+    Returns:
+        CloudFront client
+    """
+    import boto3
+
+    return boto3.client("cloudfront")
+
+
 def create_invalidation(
     distribution_id: str, paths: list = None, caller_reference: str = None
 ) -> Dict[str, Any]:
@@ -49,10 +77,12 @@ def create_invalidation(
         paths = ["/*"]
 
     if caller_reference is None:
-        caller_reference = f"runway-hook-{int(time.time())}"
+        caller_reference = f"runway-hook-{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+
+    from botocore.exceptions import ClientError, NoCredentialsError
 
     try:
-        cloudfront = boto3.client("cloudfront")
+        cloudfront = _get_client()
 
         logger.info(f"Creating invalidation for distribution {distribution_id}")
         logger.info(f"Paths to invalidate: {paths}")
@@ -120,40 +150,101 @@ def wait_for_invalidation(
     Raises:
         CloudFrontInvalidationError: If there's an error checking status
     """
+    from botocore.exceptions import WaiterError
+
     try:
-        cloudfront = boto3.client("cloudfront")
-        start_time = time.time()
+        cloudfront = _get_client()
+        waiter = cloudfront.get_waiter("invalidation_completed")
 
         logger.info(f"Waiting for invalidation {invalidation_id} to complete...")
 
-        while time.time() - start_time < timeout:
-            response = cloudfront.get_invalidation(
-                DistributionId=distribution_id, Id=invalidation_id
+        waiter.wait(
+            DistributionId=distribution_id,
+            Id=invalidation_id,
+            WaiterConfig={
+                "Delay": POLL_DELAY,
+                "MaxAttempts": max(1, timeout // POLL_DELAY),
+            },
+        )
+        logger.info("Invalidation completed successfully")
+        return True
+
+    except WaiterError as e:
+        error = (e.last_response or {}).get("Error")
+        if error:
+            raise CloudFrontInvalidationError(
+                f"Error checking invalidation status ({error.get('Code')}): "
+                f"{error.get('Message')}"
             )
+        logger.warning(f"Invalidation did not complete within {timeout} seconds")
+        return False
+    except Exception as e:
+        raise CloudFrontInvalidationError(
+            f"Unexpected error waiting for invalidation: {str(e)}"
+        )
 
-            status = response["Invalidation"]["Status"]
-            logger.info(f"Invalidation status: {status}")
 
-            if status == "Completed":
-                logger.info("Invalidation completed successfully")
-                return True
+def _invalidate(
+    distribution_id: str, paths: list, wait: bool, timeout: int
+) -> Dict[str, Any]:
+    """Create an invalidation and, if asked, wait for it to complete."""
+    result = create_invalidation(distribution_id, paths)
 
-            time.sleep(30)  # Wait 30 seconds before checking again
+    if wait:
+        result["completed"] = wait_for_invalidation(
+            distribution_id, result["invalidation_id"], timeout
+        )
 
-        logger.warning(f"Invalidation did not complete within {timeout} seconds")
-        return False
+    return result
 
-    except ClientError as e:
-        error_code = e.response["Error"]["Code"]
-        error_message = e.response["Error"]["Message"]
-        raise CloudFrontInvalidationError(
-            f"Error checking invalidation status ({error_code}): {error_message}"
-        )
-    except Exception as e:
+
+def invalidate_distributions(
+    distribution_ids: List[str],
+    paths: list = None,
+    wait: bool = False,
+    timeout: int = 900,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Invalidate several CloudFront distributions concurrently.
+
+    Each distribution is invalidated and waited on in its own thread, so the
+    API round trips and waits overlap instead of running one after another.
+
+    Args:
+        distribution_ids: CloudFront distribution IDs
+        paths: List of paths to invalidate (defaults to ['/*'])
+        wait: Whether to wait for the invalidations to complete
+        timeout: Maximum time to wait in seconds for each invalidation
+
+    Returns:
+        Invalidation results keyed by distribution ID
+
+    Raises:
+        CloudFrontInvalidationError: If any invalidation fails
+    """
+    results = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(distribution_ids))) as executor:
+        futures = {
+            distribution_id: executor.submit(
+                _invalidate, distribution_id, paths, wait, timeout
+            )
+            for distribution_id in distribution_ids
+        }
+        for distribution_id, future in futures.items():
+            try:
+                results[distribution_id] = future.result()
+            except CloudFrontInvalidationError as e:
+                errors.append(f"{distribution_id}: {e}")
+
+    if errors:
         raise CloudFrontInvalidationError(
-            f"Unexpected error waiting for invalidation: {str(e)}"
+            f"Invalidation failed for {len(errors)} distribution(s): "
+            + "; ".join(errors)
         )
 
+    return results
+
 
 def cfngin_hook(provider: Any, context: Any, **kwargs) -> Dict[str, Any]:
     """
@@ -163,39 +254,60 @@ def cfngin_hook(provider: Any, context: Any, **kwargs) -> Dict[str, Any]:
         provider: CFNgin provider instance
         context: CFNgin context
         **kwargs: Hook arguments including:
-            - distribution_id: CloudFront distribution ID (required)
+            - distribution_id: CloudFront distribution ID
+            - distribution_ids: List of CloudFront distribution IDs to invalidate
+              concurrently; a single ID string is accepted, and distribution_id
+              is added to the list when both are given (one of distribution_id
+              or distribution_ids is required)
             - paths: List of paths to invalidate (optional, defaults to ['/*'])
             - wait: Whether to wait for invalidation to complete (optional, defaults to False)
             - timeout: Timeout for waiting in seconds (optional, defaults to 900)
 
     Returns:
-        Dict containing invalidation results
+        Dict containing invalidation results; with distribution_ids, a dict
+        with the results keyed by distribution ID under "invalidations"
 
     Raises:
         ValueError: If required parameters are missing
         CloudFrontInvalidationError: If invalidation fails
     """
+    _ensure_env_loaded()
+
     distribution_id = kwargs.get("distribution_id")
-    if not distribution_id:
-        raise ValueError("distribution_id parameter is required")
+    distribution_ids = kwargs.get("distribution_ids")
+    if not distribution_id and not distribution_ids:
+        raise ValueError("distribution_id or distribution_ids parameter is required")
+
+    if distribution_ids:
+        # A YAML scalar arrives as a string; iterating it would yield letters
+        if isinstance(distribution_ids, str):
+            distribution_ids = [distribution_ids]
+        elif not isinstance(distribution_ids, (list, tuple)):
+            raise ValueError(
+                "distribution_ids parameter must be a list of distribution IDs"
+            )
+        distribution_ids = list(dict.fromkeys(
+            [distribution_id, *distribution_ids] if distribution_id else distribution_ids
+        ))
 
     paths = kwargs.get("paths", ["/*"])
     wait = kwargs.get("wait", False)
     timeout = kwargs.get("timeout", 900)
 
-    logger.info(f"Cloudfront Invalidation called for distribution: {distribution_id}")
-
-    # Create invalidation
-    result = create_invalidation(distribution_id, paths)
-
-    # Wait for completion if requested
-    if wait:
-        completed = wait_for_invalidation(
-            distribution_id, result["invalidation_id"], timeout
+    if distribution_ids:
+        logger.info(
+            f"Cloudfront Invalidation called for distributions: {', '.join(distribution_ids)}"
         )
-        result["completed"] = completed
+        return {
+            "invalidations": invalidate_distributions(
+                distribution_ids, paths, wait, timeout
+            )
+        }
 
-    return result
+    logger.info(f"Cloudfront Invalidation called for distribution: {distribution_id}")
+
+    # Create invalidation and wait for completion if requested
+    return _invalidate(distribution_id, paths, wait, timeout)
 
 
 def main():
@@ -203,7 +315,12 @@ def main():
     parser = argparse.ArgumentParser(
         description="CloudFront invalidation hook for CFNgin/Runway"
     )
-    parser.add_argument("distribution_id", help="CloudFront distribution ID")
+    parser.add_argument(
+        "distribution_ids",
+        nargs="+",
+        metavar="distribution_id",
+        help="CloudFront distribution ID(s); several are invalidated concurrently",
+    )
     parser.add_argument(
         "--paths", nargs="+", default=["/*"], help="Paths to invalidate (default: /*)"
     )
@@ -221,6 +338,7 @@ def main():
     )
 
     args = parser.parse_args()
+    _ensure_env_loaded()
 
     # Configure logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -229,14 +347,34 @@ def main():
     )
 
     try:
+        if len(args.distribution_ids) > 1:
+            results = invalidate_distributions(
+                args.distribution_ids, args.paths, args.wait, args.timeout
+            )
+            for distribution_id, result in results.items():
+                print(f"{distribution_id}: invalidation created: {result['invalidation_id']}")
+            if args.wait:
+                pending = [
+                    distribution_id
+                    for distribution_id, result in results.items()
+                    if not result["completed"]
+                ]
+                if pending:
+                    print(f"Invalidation did not complete within timeout: {', '.join(pending)}")
+                    sys.exit(1)
+                print("Invalidations completed successfully")
+            return
+
+        distribution_id = args.distribution_ids[0]
+
         # Create invalidation
-        result = create_invalidation(args.distribution_id, args.paths)
+        result = create_invalidation(distribution_id, args.paths)
         print(f"Invalidation created: {result['invalidation_id']}")
 
         # Wait for completion if requested
         if args.wait:
             completed = wait_for_invalidation(
-                args.distribution_id, result["invalidation_id"], args.timeout
+                distribution_id, result["invalidation_id"], args.timeout
             )
             if completed:
                 print("Invalidation completed successfully")
@@ -30,14 +30,23 @@ Command Line Usage:
 """
 
 import argparse
+import asyncio
+import collections
+import functools
 import json
 import logging
 import os
+import re
+import shutil
+import socket
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlparse
 
 try:
     import docker
@@ -45,6 +54,12 @@ try:
 except ImportError:
     DOCKER_CLIENT_AVAILABLE = False
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -53,26 +68,272 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Daemon socket probed when DOCKER_HOST is not set
+DEFAULT_DOCKER_SOCKET = '/var/run/docker.sock'
+
+# Lines of streamed command output kept for results and error messages
+STREAM_TAIL_LINES = 200
+
+# Lists running service names, one per line; far cheaper than JSON status
+RUNNING_SERVICES_COMMAND = ['ps', '--services', '--filter', 'status=running']
+
+# Characters Compose drops when deriving a project name from a directory
+_PROJECT_NAME_UNSAFE_RE = re.compile(r'[^a-z0-9_-]')
+
+# Service label in the comma-separated Labels field of ps JSON records
+_SERVICE_LABEL_RE = re.compile(r'(?:^|,)com\.docker\.compose\.service=([^,]*)')
+
+# Health poll schedule: first delay, growth factor and cap, in seconds
+POLL_INITIAL_DELAY = 0.25
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 5.0
+
+# Seconds a detected compose command is reused before probing again
+COMPOSE_PROBE_TTL = 60
+
+# PATH -> (compose command, time.monotonic() expiry)
+_COMPOSE_CACHE: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+
+# Integrations shared by hook calls, keyed by (compose_file, working_directory)
+_INTEGRATION_CACHE: Dict[Tuple[str, str], 'DockerComposeIntegration'] = {}
+_INTEGRATION_LOCK = threading.Lock()
+
+
 class DockerComposeError(Exception):
     """Custom exception for Docker Compose integration errors."""
     pass
 
 
+def _probe_compose_command(search_path: str) -> Tuple[str, ...]:
+    """
+    Detect the available docker compose command.
+    
+    Args:
+        search_path: Value of PATH to look the binaries up in
+        
+    Returns:
+        Tuple with the command prefix, e.g. ('docker', 'compose')
+    """
+    # Only the compose plugin needs a probe; a PATH lookup settles the rest
+    if shutil.which('docker', path=search_path or None):
+        try:
+            result = subprocess.run(
+                ['docker', 'compose', 'version'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                logger.info(f"Docker Compose version: {result.stdout.strip()}")
+                return ('docker', 'compose')
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+    
+    # Fall back to docker-compose (legacy version)
+    if shutil.which('docker-compose', path=search_path or None):
+        logger.info("Using legacy docker-compose")
+        return ('docker-compose',)
+    
+    raise DockerComposeError("Neither 'docker compose' nor 'docker-compose' command is available")
+
+
+def _detect_compose_command(search_path: str) -> Tuple[str, ...]:
+    """
+    Detect the docker compose command, reusing a recent probe.
+    
+    Results are cached per PATH for COMPOSE_PROBE_TTL seconds, so every
+    DockerComposeIntegration and hook call in a run shares one probe while
+    a reinstalled or upgraded Docker is still picked up; failures are not
+    cached and are re-probed.
+    
+    Args:
+        search_path: Value of PATH the probe runs under (cache key)
+        
+    Returns:
+        Tuple with the command prefix, e.g. ('docker', 'compose')
+    """
+    cached = _COMPOSE_CACHE.get(search_path)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    
+    command = _probe_compose_command(search_path)
+    _COMPOSE_CACHE[search_path] = (command, time.monotonic() + COMPOSE_PROBE_TTL)
+    return command
+
+
+def _docker_context() -> str:
+    """
+    Name of the active ``docker context``.
+    
+    ``DOCKER_CONTEXT`` wins over the ``currentContext`` that ``docker
+    context use`` stores in the CLI config file.
+    """
+    context = os.environ.get('DOCKER_CONTEXT')
+    if context:
+        return context
+    
+    config_dir = os.environ.get('DOCKER_CONFIG') or os.path.join(os.path.expanduser('~'), '.docker')
+    try:
+        with open(os.path.join(config_dir, 'config.json'), 'rb') as config_file:
+            config = json.load(config_file)
+    except (OSError, ValueError):
+        return 'default'
+    return (config.get('currentContext') if isinstance(config, dict) else None) or 'default'
+
+
+def _docker_socket_reachable(timeout: float = 0.2) -> bool:
+    """
+    Cheaply check that the Docker daemon socket accepts connections.
+    
+    Honors ``DOCKER_HOST`` for unix:// and tcp:// endpoints. Endpoints that
+    cannot be probed with a plain socket (ssh://, npipe://, or a non-default
+    ``docker context``, e.g. rootless Docker, Docker Desktop or colima) are
+    assumed reachable and left to the CLI, as is a missing default socket.
+    
+    Args:
+        timeout: Connect timeout in seconds
+        
+    Returns:
+        False only if the daemon is known to be unreachable
+    """
+    docker_host = os.environ.get('DOCKER_HOST', '')
+    if not docker_host and _docker_context() != 'default':
+        return True
+    
+    if not docker_host or docker_host.startswith('unix://'):
+        if not hasattr(socket, 'AF_UNIX'):
+            # Windows defaults to a named pipe
+            return True
+        path = docker_host[len('unix://'):] or DEFAULT_DOCKER_SOCKET
+        if not docker_host and not os.path.exists(path):
+            # The daemon may listen elsewhere; let the CLI find out
+            return True
+        family, address = socket.AF_UNIX, path
+    elif docker_host.startswith('tcp://'):
+        parsed = urlparse(docker_host)
+        family, address = socket.AF_INET, (parsed.hostname, parsed.port or 2375)
+    else:
+        return True
+    
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except OSError:
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def _path_exists(path: str) -> bool:
+    """Check (and cache) whether a file exists; cleared by every start and stop."""
+    return os.path.isfile(path)
+
+
+_T = TypeVar('_T')
+
+
+def _run_coroutine(coro: Awaitable[_T]) -> _T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    asyncio.run cannot be nested, so when the caller is itself running an
+    event loop the coroutine runs on a worker thread with a loop of its own.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _log_command(full_cmd: List[str]) -> None:
+    """Log a command line, joining it only when INFO is enabled."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Executing: %s", ' '.join(full_cmd))
+
+
+def _parse_compose_ps(output: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse ``docker compose ps --format json`` output in a single pass.
+    
+    Newer Compose releases print one JSON object per line, older ones a
+    single JSON array; the first byte tells them apart.
+    
+    Args:
+        output: Raw command output
+        
+    Returns:
+        List of container records
+        
+    Raises:
+        ValueError: If the output is not valid JSON
+    """
+    stripped = output.strip()
+    if not stripped:
+        return []
+    if stripped.startswith(b'['):
+        return _json_loads(stripped)
+    return [_json_loads(line) for line in stripped.splitlines() if line.strip()]
+
+
+def _service_name(record: Dict[str, Any]) -> str:
+    """
+    Get the compose service name of a ``ps --format json`` record.
+    
+    Uses the Service field, then the com.docker.compose.service label
+    for releases that omit it, and finally the container name.
+    
+    Args:
+        record: Container record
+        
+    Returns:
+        Service name, or '' if the record has none
+    """
+    service_name = record.get('Service')
+    if service_name:
+        return service_name
+    
+    labels = record.get('Labels') or ''
+    if isinstance(labels, dict):
+        service_name = labels.get('com.docker.compose.service')
+    else:
+        match = _SERVICE_LABEL_RE.search(labels)
+        service_name = match.group(1) if match else None
+    return service_name or record.get('Name', '')
+
+
 class DockerComposeIntegration:
     """Docker Compose integration for Runway deployments."""
     
     def __init__(self, compose_file: str = "docker-compose.yml", 
-                 working_directory: Optional[str] = None):
+                 working_directory: Optional[str] = None,
+                 parallel_limit: Optional[int] = None):
         """
         Initialize Docker Compose integration.
         
         Args:
             compose_file: Path to docker-compose.yml file
             working_directory: Directory to run docker-compose commands from
+            parallel_limit: COMPOSE_PARALLEL_LIMIT for every compose command,
+                e.g. to throttle pulls on constrained hosts (None for the
+                Compose default)
         """
         self.compose_file = compose_file
         self.working_directory = working_directory or os.getcwd()
-        self.compose_path = Path(self.working_directory) / compose_file
+        self.parallel_limit = parallel_limit
+        self.compose_path = Path(self.working_directory, compose_file)
+        self._verified = False
+        self._compose_stat: Optional[os.stat_result] = None
+        self._refresh_stat()
         
         # Initialize Docker client if available
         self.docker_client = None
@@ -82,104 +343,388 @@ class DockerComposeIntegration:
             except Exception as e:
                 logger.warning(f"Could not initialize Docker client: {e}")
     
-    def _check_docker_compose(self) -> bool:
-        """Check if Docker Compose is installed and available."""
+    def _compose_env(self, parallel_limit: Optional[int] = None) -> Dict[str, str]:
+        """
+        Environment for compose commands: no CLI hints, optional parallel limit.
+        
+        A per-call parallel_limit takes precedence over the instance's, so
+        hooks sharing one integration do not leak limits into each other.
+        """
+        env = dict(os.environ, DOCKER_CLI_HINTS='false')
+        if parallel_limit is None:
+            parallel_limit = self.parallel_limit
+        if parallel_limit is not None:
+            env['COMPOSE_PARALLEL_LIMIT'] = str(parallel_limit)
+        return env
+    
+    @property
+    def compose_path_exists(self) -> bool:
+        """Whether the compose file existed when last stat'd."""
+        return self._compose_stat is not None
+    
+    def _refresh_stat(self) -> bool:
+        """Re-stat the compose file and return whether it exists."""
         try:
-            # Try docker compose (newer version)
-            result = subprocess.run(
-                ['docker', 'compose', 'version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                logger.info(f"Docker Compose version: {result.stdout.strip()}")
-                return True
-            
-            # Try docker-compose (legacy version)
-            result = subprocess.run(
-                ['docker-compose', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                logger.info(f"Docker Compose version: {result.stdout.strip()}")
-                return True
-            
+            self._compose_stat = os.stat(self.compose_path)
+        except OSError:
+            self._compose_stat = None
+        return self._compose_stat is not None
+    
+    def _check_docker_compose(self) -> bool:
+        """
+        Check if Docker Compose is installed and available.
+        
+        A successful check is remembered, so a stop after a start on the
+        same instance does not probe again.
+        """
+        if self._verified:
+            return True
+        
+        # Compose cannot do anything without the daemon; skip forking the CLI
+        if not _docker_socket_reachable():
+            logger.error("Docker daemon not reachable")
             return False
-            
-        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            logger.error(f"Docker Compose not found or timeout: {e}")
+        
+        try:
+            self._get_compose_command()
+            self._verified = True
+            return True
+        except DockerComposeError as e:
+            logger.error(f"Docker Compose not found: {e}")
             return False
     
     def _get_compose_command(self) -> List[str]:
-        """Get the appropriate docker-compose command."""
-        # Try docker compose first (newer version)
-        try:
-            result = subprocess.run(
-                ['docker', 'compose', 'version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                return ['docker', 'compose']
-        except:
-            pass
+        """Get the appropriate docker-compose command (probe cached per COMPOSE_PROBE_TTL)."""
+        return list(_detect_compose_command(os.environ.get('PATH', '')))
+    
+    def _run_compose_command(self, command: List[str], timeout: int = 300,
+                             text: bool = True,
+                             stream: bool = False,
+                             parallel_limit: Optional[int] = None) -> subprocess.CompletedProcess:
+        """
+        Run a docker-compose command.
         
-        # Fall back to docker-compose (legacy version)
-        try:
-            result = subprocess.run(
-                ['docker-compose', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                return ['docker-compose']
-        except:
-            pass
+        Args:
+            command: Compose subcommand and arguments
+            timeout: Timeout in seconds
+            text: Decode output to str; pass False to get raw bytes for
+                output that is parsed directly (e.g. ``ps --format json``)
+            stream: Log output lines as they arrive instead of buffering
+                them; only the last STREAM_TAIL_LINES are returned, as both
+                stdout and (on failure) stderr
+            parallel_limit: COMPOSE_PARALLEL_LIMIT for this command (None for
+                the instance's)
+        """
+        compose_cmd = self._get_compose_command()
+        full_cmd = compose_cmd + ['-f', self.compose_file] + command
+        
+        _log_command(full_cmd)
         
-        raise DockerComposeError("Neither 'docker compose' nor 'docker-compose' command is available")
+        if stream:
+            return self._run_streamed(full_cmd, timeout, parallel_limit)
+        
+        return subprocess.run(
+            full_cmd,
+            capture_output=True,
+            text=text,
+            timeout=timeout,
+            cwd=self.working_directory,
+            env=self._compose_env(parallel_limit)
+        )
+    
+    def _run_streamed(self, full_cmd: List[str], timeout: int,
+                      parallel_limit: Optional[int] = None) -> subprocess.CompletedProcess:
+        """Run a command, logging merged stdout/stderr lines as they arrive."""
+        tail: Deque[str] = collections.deque(maxlen=STREAM_TAIL_LINES)
+        with subprocess.Popen(
+            full_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            cwd=self.working_directory,
+            env=self._compose_env(parallel_limit)
+        ) as process:
+            # Reading blocks, so enforce the timeout by killing the process
+            timed_out = threading.Event()
+            
+            def kill() -> None:
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    line = line.rstrip()
+                    logger.info(line)
+                    tail.append(line)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(full_cmd, timeout)
+        
+        output = '\n'.join(tail)
+        return subprocess.CompletedProcess(
+            full_cmd, returncode, output, output if returncode else ''
+        )
     
-    def _run_compose_command(self, command: List[str], timeout: int = 300) -> subprocess.CompletedProcess:
-        """Run a docker-compose command."""
+    async def _run_compose_command_async(
+        self,
+        command: List[str],
+        timeout: int = 300,
+        text: bool = True,
+        parallel_limit: Optional[int] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a docker-compose command without blocking the event loop.
+        
+        Args:
+            command: Compose subcommand and arguments
+            timeout: Timeout in seconds
+            text: Decode output to str; pass False to get raw bytes
+            parallel_limit: COMPOSE_PARALLEL_LIMIT for this command (None for
+                the instance's)
+            
+        Returns:
+            CompletedProcess, as returned by _run_compose_command
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command does not finish in time
+        """
         compose_cmd = self._get_compose_command()
         full_cmd = compose_cmd + ['-f', self.compose_file] + command
         
-        logger.info(f"Executing: {' '.join(full_cmd)}")
+        _log_command(full_cmd)
         
-        # Change to working directory
-        original_cwd = os.getcwd()
+        process = await asyncio.create_subprocess_exec(
+            *full_cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.working_directory,
+            env=self._compose_env(parallel_limit)
+        )
         try:
-            os.chdir(self.working_directory)
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(full_cmd, timeout)
+        
+        if text:
+            stdout = stdout.decode(errors='replace')
+            stderr = stderr.decode(errors='replace')
+        return subprocess.CompletedProcess(full_cmd, process.returncode, stdout, stderr)
+    
+    @staticmethod
+    def _parallel_options(parallelism: Optional[int]) -> List[str]:
+        """Global ``--parallel`` option, which goes before the subcommand."""
+        if parallelism is None:
+            return []
+        return ['--parallel', str(parallelism)]
+    
+    def _stream_compose_json(self, command: List[str],
+                             timeout: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Run a compose command with JSON output and yield records as they arrive.
+        
+        Handles both the JSON lines format of newer Compose releases and the
+        single JSON array printed by older ones.
+        
+        Args:
+            command: Compose subcommand and arguments, e.g. ['ps', '--format', 'json']
+            timeout: Seconds to wait for the command to exit once output ends
             
-            result = subprocess.run(
-                full_cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+        Yields:
+            Decoded JSON object for each container
             
-            return result
+        Raises:
+            DockerComposeError: If the command exits non-zero
+        """
+        full_cmd = self._get_compose_command() + ['-f', self.compose_file] + command
+        _log_command(full_cmd)
+        
+        with subprocess.Popen(
+            full_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.working_directory,
+            env=self._compose_env()
+        ) as process:
+            for line in process.stdout:
+                if not line.strip():
+                    continue
+                record = _json_loads(line)
+                if isinstance(record, list):
+                    yield from record
+                else:
+                    yield record
             
-        finally:
-            os.chdir(original_cwd)
+            stderr = process.stderr.read()
+            if process.wait(timeout=timeout) != 0:
+                raise DockerComposeError(stderr.decode(errors='replace').strip())
     
     def _check_env_file(self, env_file: Optional[str] = None) -> bool:
         """Check if required environment file exists."""
         if not env_file:
             return True
         
-        env_path = Path(self.working_directory) / env_file
-        if not env_path.exists():
+        env_path = os.path.join(self.working_directory, env_file)
+        if not _path_exists(env_path):
             logger.warning(f"Environment file not found: {env_path}")
             return False
         
         logger.info(f"Environment file found: {env_path}")
         return True
     
+    @staticmethod
+    def _parse_service_statuses(output: bytes) -> Dict[str, Dict[str, str]]:
+        """
+        Parse ``docker compose ps --format json`` output into service states.
+        
+        Args:
+            output: Raw command output, JSON lines or a single JSON array
+            
+        Returns:
+            Mapping of service name to its 'state' and 'health'
+        """
+        service_statuses = {}
+        
+        try:
+            records = _parse_compose_ps(output)
+        except ValueError:
+            logger.warning("Could not parse service status output: "
+                           f"{output.decode(errors='replace')}")
+            return service_statuses
+        
+        if not records:
+            logger.warning("No service status output")
+        
+        for service_info in records:
+            service_name = _service_name(service_info)
+            service_statuses[service_name] = {
+                'state': service_info.get('State', ''),
+                'health': service_info.get('Health', '')
+            }
+        
+        return service_statuses
+    
+    @staticmethod
+    def _all_running(services: List[str], output: str) -> bool:
+        """Check ``ps --services --filter status=running`` output covers all services."""
+        missing = set(services).difference(output.split())
+        if missing:
+            logger.info(f"Services not running yet: {sorted(missing)}")
+        return not missing
+    
+    @staticmethod
+    def _services_healthy(services: List[str],
+                          service_statuses: Dict[str, Dict[str, str]]) -> bool:
+        """Check if all requested services are running and healthy."""
+        for service in services:
+            status = service_statuses.get(service, {})
+            state = status.get('state', '').lower()
+            health = status.get('health', '').lower()
+            
+            if 'running' not in state:
+                logger.info(f"Service {service} not running (state: {state})")
+                return False
+            
+            # If health check is defined, wait for it to be healthy
+            if health and health not in ['healthy', '']:
+                logger.info(f"Service {service} not healthy (health: {health})")
+                return False
+        
+        return True
+    
+    @staticmethod
+    def _container_ready(attrs: Dict[str, Any]) -> bool:
+        """Whether a container is healthy, or running if it has no healthcheck."""
+        state = attrs.get('State', {})
+        health = state.get('Health')
+        if health:
+            return health.get('Status') == 'healthy'
+        return bool(state.get('Running'))
+    
+    def _project_name(self) -> str:
+        """
+        Compose project name: COMPOSE_PROJECT_NAME, else the compose file's directory.
+        
+        Follows Compose's normalization of directory names; a top-level
+        ``name:`` in the compose file is not read.
+        """
+        name = os.environ.get('COMPOSE_PROJECT_NAME')
+        if not name:
+            name = os.path.basename(os.path.dirname(os.path.abspath(self.compose_path)))
+        return _PROJECT_NAME_UNSAFE_RE.sub('', name.lower()).lstrip('_-')
+    
+    def _wait_for_services_events(self, services: List[str], timeout: int) -> bool:
+        """
+        Wait for services to be healthy using Docker engine events.
+        
+        Takes a snapshot of the project's containers, then blocks on the
+        engine's event stream and re-inspects a container only when it
+        starts, dies or changes health, so readiness is seen immediately.
+        
+        Args:
+            services: Services that must become ready
+            timeout: Timeout in seconds
+            
+        Returns:
+            True if all services became ready before the timeout
+            
+        Raises:
+            DockerComposeError: If no containers carry the project label, so
+                the caller can fall back to polling
+        """
+        project_label = f"com.docker.compose.project={self._project_name()}"
+        # The engine filters events by wall-clock timestamps
+        since = int(time.time())
+        deadline = since + timeout
+        
+        ready: Dict[str, bool] = {}
+        for container in self.docker_client.containers.list(
+            all=True, filters={'label': project_label}
+        ):
+            service = container.labels.get('com.docker.compose.service')
+            ready[service] = self._container_ready(container.attrs)
+        
+        if not ready:
+            # A project name we derived wrongly would leave the wait hanging
+            raise DockerComposeError(f"No containers labelled {project_label}")
+        
+        if all(ready.get(service) for service in services):
+            logger.info("All services are healthy")
+            return True
+        
+        events = self.docker_client.events(
+            decode=True,
+            since=since,
+            until=deadline,
+            filters={
+                'type': 'container',
+                'event': ['start', 'die', 'health_status'],
+                'label': project_label
+            }
+        )
+        try:
+            for event in events:
+                container = self.docker_client.containers.get(event['id'])
+                service = container.labels.get('com.docker.compose.service')
+                ready[service] = self._container_ready(container.attrs)
+                logger.info(f"Service {service} {event.get('status', '')}")
+                
+                if all(ready.get(service) for service in services):
+                    logger.info("All services are healthy")
+                    return True
+        finally:
+            events.close()
+        
+        logger.error(f"Timeout waiting for services to be healthy after {timeout}s")
+        return False
+    
     def _wait_for_services(self, services: Optional[List[str]] = None, 
                           timeout: int = 300) -> bool:
         """Wait for services to be healthy."""
@@ -188,99 +733,301 @@ class DockerComposeIntegration:
             return True
         
         logger.info(f"Waiting for services to be healthy: {services}")
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         
-        while time.time() - start_time < timeout:
+        # Prefer the engine's event stream over polling 'compose ps'
+        if self.docker_client is not None:
             try:
-                # Check service health using docker-compose ps
-                result = self._run_compose_command(['ps', '--format', 'json'], timeout=30)
-                
-                if result.returncode != 0:
-                    logger.warning(f"Failed to get service status: {result.stderr}")
-                    time.sleep(10)
-                    continue
+                return self._wait_for_services_events(services, timeout)
+            except Exception as e:
+                logger.warning(f"Docker event stream unavailable, polling instead: {e}")
+        
+        # Poll quickly at first and back off; start over whenever another
+        # service comes up, as the rest usually follow shortly
+        all_running = False
+        running_count = 0
+        delay = POLL_INITIAL_DELAY
+        while time.monotonic() < deadline:
+            try:
+                # Wait for containers to run using the cheap service-name listing
+                # before paying for the full JSON status
+                if not all_running:
+                    result = self._run_compose_command(RUNNING_SERVICES_COMMAND, timeout=30)
+                    if result.returncode == 0:
+                        count = len(set(services).intersection(result.stdout.split()))
+                        if count > running_count:
+                            running_count = count
+                            delay = POLL_INITIAL_DELAY
+                        all_running = self._all_running(services, result.stdout)
                 
-                # Parse service status
-                all_healthy = True
-                service_statuses = {}
+                if all_running:
+                    # Check service health using docker-compose ps
+                    result = self._run_compose_command(['ps', '--format', 'json'], timeout=30,
+                                                       text=False)
+                    
+                    if result.returncode != 0:
+                        error = result.stderr.decode(errors='replace')
+                        logger.warning("Failed to get service status: %s", error)
+                    elif self._services_healthy(services,
+                                                self._parse_service_statuses(result.stdout)):
+                        logger.info("All services are healthy")
+                        return True
                 
-                # Handle both single JSON object and JSON lines format
-                output = result.stdout.strip()
-                if not output:
-                    logger.warning("No service status output")
-                    time.sleep(10)
-                    continue
+                logger.info("Waiting for services... (%ds elapsed)",
+                            timeout - (deadline - time.monotonic()))
                 
-                # Try to parse as JSON lines first
-                try:
-                    for line in output.split('\n'):
-                        if line.strip():
-                            service_info = json.loads(line)
-                            service_name = service_info.get('Service', service_info.get('Name', ''))
-                            service_state = service_info.get('State', '')
-                            service_health = service_info.get('Health', '')
-                            
-                            # Extract service name from container name if needed
-                            if not service_name and 'Name' in service_info:
-                                container_name = service_info['Name']
-                                # Extract service name from container name (e.g., cmm-api-public -> api-public)
-                                if container_name.startswith('cmm-'):
-                                    service_name = container_name[4:]  # Remove 'cmm-' prefix
-                            
-                            service_statuses[service_name] = {
-                                'state': service_state,
-                                'health': service_health
-                            }
-                except json.JSONDecodeError:
-                    # Try parsing as single JSON object
-                    try:
-                        services_data = json.loads(output)
-                        if isinstance(services_data, list):
-                            for service_info in services_data:
-                                service_name = service_info.get('Service', service_info.get('Name', ''))
-                                service_state = service_info.get('State', '')
-                                service_health = service_info.get('Health', '')
-                                
-                                service_statuses[service_name] = {
-                                    'state': service_state,
-                                    'health': service_health
-                                }
-                    except json.JSONDecodeError:
-                        logger.warning(f"Could not parse service status output: {output}")
-                        time.sleep(10)
-                        continue
+            except Exception as e:
+                logger.warning(f"Error checking service health: {e}")
+            
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+        
+        logger.error(f"Timeout waiting for services to be healthy after {timeout}s")
+        return False
+    
+    async def _wait_for_services_async(self, services: Optional[List[str]] = None,
+                                       timeout: int = 300) -> bool:
+        """Wait for services to be healthy without blocking the event loop."""
+        if not services:
+            logger.info("No specific services to wait for")
+            return True
+        
+        logger.info(f"Waiting for services to be healthy: {services}")
+        deadline = time.monotonic() + timeout
+        
+        # Same poll schedule as _wait_for_services
+        all_running = False
+        running_count = 0
+        delay = POLL_INITIAL_DELAY
+        while time.monotonic() < deadline:
+            try:
+                if not all_running:
+                    result = await self._run_compose_command_async(
+                        RUNNING_SERVICES_COMMAND, timeout=30
+                    )
+                    if result.returncode == 0:
+                        count = len(set(services).intersection(result.stdout.split()))
+                        if count > running_count:
+                            running_count = count
+                            delay = POLL_INITIAL_DELAY
+                        all_running = self._all_running(services, result.stdout)
                 
-                # Check if all requested services are healthy
-                for service in services:
-                    status = service_statuses.get(service, {})
-                    state = status.get('state', '').lower()
-                    health = status.get('health', '').lower()
+                if all_running:
+                    result = await self._run_compose_command_async(
+                        ['ps', '--format', 'json'], timeout=30, text=False
+                    )
                     
-                    if 'running' not in state:
-                        logger.info(f"Service {service} not running (state: {state})")
-                        all_healthy = False
-                        break
-                    
-                    # If health check is defined, wait for it to be healthy
-                    if health and health not in ['healthy', '']:
-                        logger.info(f"Service {service} not healthy (health: {health})")
-                        all_healthy = False
-                        break
-                
-                if all_healthy:
-                    logger.info("All services are healthy")
-                    return True
-                
-                logger.info(f"Waiting for services... ({int(time.time() - start_time)}s elapsed)")
-                time.sleep(10)
+                    if result.returncode != 0:
+                        error = result.stderr.decode(errors='replace')
+                        logger.warning("Failed to get service status: %s", error)
+                    elif self._services_healthy(services,
+                                                self._parse_service_statuses(result.stdout)):
+                        logger.info("All services are healthy")
+                        return True
                 
             except Exception as e:
                 logger.warning(f"Error checking service health: {e}")
-                time.sleep(10)
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
         
         logger.error(f"Timeout waiting for services to be healthy after {timeout}s")
         return False
     
+    def _check_start_prerequisites(self, env_file: Optional[str]) -> None:
+        """Validate Docker Compose, the compose file and the env file before start."""
+        # The env file may have been written or removed since the last hook
+        _path_exists.cache_clear()
+        
+        if not self._check_docker_compose():
+            raise DockerComposeError("Docker Compose is not available")
+        
+        # Only a missing file is re-checked; it may have been written since init
+        if not (self.compose_path_exists or self._refresh_stat()):
+            raise DockerComposeError(f"Docker Compose file not found: {self.compose_path}")
+        
+        if not self._check_env_file(env_file):
+            logger.warning("Environment file missing - containers may not start properly")
+    
+    def _up_command(
+        self,
+        services: Optional[List[str]],
+        detached: bool,
+        build: bool,
+        wait_timeout: int,
+        health_check: bool,
+        parallelism: Optional[int]
+    ) -> Tuple[List[str], int, bool]:
+        """
+        Build the ``up`` command for start_containers.
+        
+        Returns:
+            Tuple of (command, subprocess timeout, whether up itself waits
+            for health)
+        """
+        # Start containers, building images in the same invocation if requested
+        up_cmd = self._parallel_options(parallelism) + ['up']
+        if detached:
+            up_cmd.append('-d')
+        if build:
+            up_cmd.append('--build')
+        
+        compose_v2 = self._get_compose_command() == ['docker', 'compose']
+        if compose_v2:
+            # Skip per-layer pull progress, which would only be logged
+            up_cmd.append('--quiet-pull')
+            if not detached:
+                up_cmd.append('--no-log-prefix')
+        
+        # Compose v2 can block until services are healthy itself; legacy
+        # docker-compose has no --wait, so fall back to polling afterwards
+        wait_in_up = health_check and detached and compose_v2
+        if wait_in_up:
+            up_cmd.extend(['--wait', '--wait-timeout', str(wait_timeout)])
+        if services:
+            up_cmd.extend(services)
+        
+        # Allow the previous separate build step's budget on top of the wait
+        timeout = wait_timeout + 600 if build else wait_timeout
+        if wait_in_up:
+            timeout += wait_timeout
+        
+        return up_cmd, timeout, wait_in_up
+    
+    async def _service_start_levels(self, services: Optional[List[str]]) -> List[List[str]]:
+        """
+        Group services into start levels by their ``depends_on`` topology.
+        
+        Every service in a level depends only on services in earlier levels.
+        Dependencies of the requested services are included, as ``up`` would
+        start them too.
+        
+        Args:
+            services: Services to start (None for all)
+        
+        Returns:
+            List of levels, each a sorted list of service names
+        
+        Raises:
+            DockerComposeError: If the config cannot be read or has a cycle
+        """
+        result = await self._run_compose_command_async(
+            ['config', '--format', 'json'], timeout=60, text=False
+        )
+        if result.returncode != 0:
+            raise DockerComposeError(
+                f"Failed to read compose config: {result.stderr.decode(errors='replace')}"
+            )
+        
+        # depends_on is a mapping in normalized config, a list in short syntax
+        depends_on = {
+            name: set(definition.get('depends_on') or ())
+            for name, definition in _json_loads(result.stdout).get('services', {}).items()
+        }
+        
+        wanted = set(services or depends_on)
+        pending = list(wanted)
+        while pending:
+            for dependency in depends_on.get(pending.pop(), ()):
+                if dependency not in wanted:
+                    wanted.add(dependency)
+                    pending.append(dependency)
+        
+        levels = []
+        started = set()
+        while len(started) < len(wanted):
+            level = sorted(
+                name for name in wanted - started
+                if depends_on.get(name, set()) <= started
+            )
+            if not level:
+                raise DockerComposeError(
+                    f"Circular depends_on between services: {sorted(wanted - started)}"
+                )
+            levels.append(level)
+            started.update(level)
+        
+        return levels
+        
+    async def _up_in_batches(
+        self,
+        services: Optional[List[str]],
+        build: bool,
+        wait_timeout: int,
+        health_check: bool,
+        parallelism: Optional[int],
+        batch_size: int,
+        parallel_limit: Optional[int] = None
+    ) -> str:
+        """
+        Start services level by level, at most batch_size ``up`` calls at once.
+        
+        Each service gets its own ``up -d --no-deps`` so the load on the
+        host is bounded by batch_size; with health_check each call also
+        waits for its service, so dependents start only once it is healthy.
+        
+        Returns:
+            Combined output of the ``up`` calls
+        
+        Raises:
+            DockerComposeError: If Compose v2 is unavailable or a service
+                fails to start
+        """
+        if self._get_compose_command() != ['docker', 'compose']:
+            raise DockerComposeError("Batched start requires 'docker compose' (v2)")
+        
+        semaphore = asyncio.Semaphore(batch_size)
+        timeout = wait_timeout + 600 if build else wait_timeout
+        
+        async def start(service: str) -> str:
+            up_cmd = self._parallel_options(parallelism) + ['up', '-d', '--no-deps', '--quiet-pull']
+            if build:
+                up_cmd.append('--build')
+            if health_check:
+                up_cmd.extend(['--wait', '--wait-timeout', str(wait_timeout)])
+            up_cmd.append(service)
+            
+            async with semaphore:
+                result = await self._run_compose_command_async(
+                    up_cmd, timeout=timeout, parallel_limit=parallel_limit
+                )
+            if result.returncode != 0:
+                raise DockerComposeError(f"Failed to start {service}: {result.stderr}")
+            return result.stdout
+        
+        outputs = []
+        for level in await self._service_start_levels(services):
+            logger.info(f"Starting batch: {level}")
+            outputs.extend(await asyncio.gather(*(start(service) for service in level)))
+        
+        return ''.join(outputs)
+    
+    def _stop_command(
+        self,
+        services: Optional[List[str]],
+        cleanup: bool,
+        remove_volumes: bool,
+        timeout: int,
+        parallelism: Optional[int]
+    ) -> List[str]:
+        """Build the ``down`` (cleanup) or ``stop`` command for stop_containers."""
+        if remove_volumes and not cleanup:
+            # Only 'down' removes volumes; 'stop' + 'rm -v' would cost two invocations
+            logger.warning("remove_volumes has no effect without cleanup; volumes are kept")
+        
+        if cleanup:
+            # Use down command for cleanup
+            stop_cmd = self._parallel_options(parallelism) + ['down']
+            if remove_volumes:
+                stop_cmd.append('-v')
+        else:
+            # Use stop command to just stop containers
+            stop_cmd = self._parallel_options(parallelism) + ['stop']
+            if services:
+                stop_cmd.extend(services)
+        stop_cmd.extend(['--timeout', str(timeout)])
+        return stop_cmd
+    
     def start_containers(
         self,
         services: Optional[List[str]] = None,
@@ -288,7 +1035,10 @@ class DockerComposeIntegration:
         detached: bool = True,
         build: bool = False,
         wait_timeout: int = 300,
-        health_check: bool = True
+        health_check: bool = True,
+        parallelism: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        parallel_limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Start Docker Compose containers.
@@ -300,56 +1050,47 @@ class DockerComposeIntegration:
             build: Build images before starting
             wait_timeout: Timeout for waiting for services to be healthy
             health_check: Whether to wait for health checks
+            parallelism: Max concurrent engine operations (Compose v2.22+
+                ``--parallel``); None uses the Compose default
+            batch_size: Start services in dependency order, at most this
+                many ``up`` calls at once (detached, Compose v2); None
+                starts everything with a single ``up``
+            parallel_limit: COMPOSE_PARALLEL_LIMIT for the ``up`` calls (None
+                for the instance's)
             
         Returns:
             Dictionary with operation results
         """
         logger.info("Starting Docker Compose containers")
+        self._check_start_prerequisites(env_file)
         
-        # Check prerequisites
-        if not self._check_docker_compose():
-            raise DockerComposeError("Docker Compose is not available")
-        
-        if not self.compose_path.exists():
-            raise DockerComposeError(f"Docker Compose file not found: {self.compose_path}")
-        
-        if not self._check_env_file(env_file):
-            logger.warning("Environment file missing - containers may not start properly")
+        if batch_size is not None and not detached:
+            raise DockerComposeError("batch_size requires detached mode")
         
         try:
-            # Build images if requested
-            if build:
-                logger.info("Building Docker images...")
-                build_cmd = ['build']
-                if services:
-                    build_cmd.extend(services)
+            logger.info(f"Starting containers: {services or 'all services'} (build={build})")
+            if batch_size is not None:
+                output = _run_coroutine(self._up_in_batches(
+                    services, build, wait_timeout, health_check, parallelism, batch_size,
+                    parallel_limit
+                ))
+                wait_in_up = True
+            else:
+                up_cmd, timeout, wait_in_up = self._up_command(
+                    services, detached, build, wait_timeout, health_check, parallelism
+                )
+                result = self._run_compose_command(up_cmd, timeout=timeout, stream=True,
+                                                   parallel_limit=parallel_limit)
                 
-                result = self._run_compose_command(build_cmd, timeout=600)
                 if result.returncode != 0:
-                    logger.error(f"Build failed: {result.stderr}")
-                    raise DockerComposeError(f"Docker build failed: {result.stderr}")
-                
-                logger.info("Docker images built successfully")
-            
-            # Start containers
-            up_cmd = ['up']
-            if detached:
-                up_cmd.append('-d')
-            if services:
-                up_cmd.extend(services)
-            
-            logger.info(f"Starting containers: {services or 'all services'}")
-            result = self._run_compose_command(up_cmd, timeout=wait_timeout)
-            
-            if result.returncode != 0:
-                logger.error(f"Container startup failed: {result.stderr}")
-                raise DockerComposeError(f"Failed to start containers: {result.stderr}")
+                    logger.error("Container startup failed: %s", result.stderr)
+                    raise DockerComposeError(f"Failed to start containers: {result.stderr}")
+                output = result.stdout
             
             logger.info("Containers started successfully")
-            logger.info(f"Command output: {result.stdout}")
             
             # Wait for services to be healthy if requested
-            if health_check and detached:
+            if health_check and detached and not wait_in_up:
                 if not self._wait_for_services(services, wait_timeout):
                     logger.warning("Some services may not be healthy, but continuing...")
             
@@ -357,7 +1098,7 @@ class DockerComposeIntegration:
                 'success': True,
                 'services': services or 'all',
                 'message': 'Containers started successfully',
-                'command_output': result.stdout
+                'command_output': output
             }
             
         except subprocess.TimeoutExpired:
@@ -373,55 +1114,55 @@ class DockerComposeIntegration:
         services: Optional[List[str]] = None,
         cleanup: bool = False,
         remove_volumes: bool = False,
-        timeout: int = 30
+        timeout: int = 30,
+        parallelism: Optional[int] = None,
+        parallel_limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Stop Docker Compose containers.
         
+        All services are stopped by a single compose invocation, which
+        Compose fans out concurrently.
+        
         Args:
             services: List of specific services to stop (None for all)
             cleanup: Whether to remove containers after stopping
             remove_volumes: Whether to remove volumes during cleanup
             timeout: Timeout for stopping containers
+            parallelism: Max concurrent engine operations (Compose v2.22+
+                ``--parallel``); None uses the Compose default
+            parallel_limit: COMPOSE_PARALLEL_LIMIT for the stop command (None
+                for the instance's)
             
         Returns:
             Dictionary with operation results
         """
         logger.info("Stopping Docker Compose containers")
         
+        # Files may be removed or regenerated before the next start
+        _path_exists.cache_clear()
+        
         # Check prerequisites
         if not self._check_docker_compose():
             raise DockerComposeError("Docker Compose is not available")
         
+        stop_cmd = self._stop_command(services, cleanup, remove_volumes, timeout, parallelism)
+        
         try:
-            # Stop containers
             if cleanup:
-                # Use down command for cleanup
-                down_cmd = ['down']
-                if remove_volumes:
-                    down_cmd.append('-v')
-                down_cmd.extend(['--timeout', str(timeout)])
-                
                 logger.info("Stopping and removing containers...")
-                result = self._run_compose_command(down_cmd, timeout=timeout + 60)
-                
             else:
-                # Use stop command to just stop containers
-                stop_cmd = ['stop']
-                if services:
-                    stop_cmd.extend(services)
-                stop_cmd.extend(['--timeout', str(timeout)])
-                
                 logger.info(f"Stopping containers: {services or 'all services'}")
-                result = self._run_compose_command(stop_cmd, timeout=timeout + 60)
+            result = self._run_compose_command(stop_cmd, timeout=timeout + 60,
+                                               parallel_limit=parallel_limit)
             
             if result.returncode != 0:
-                logger.warning(f"Stop command completed with warnings: {result.stderr}")
+                logger.warning("Stop command completed with warnings: %s", result.stderr)
                 # Don't raise error for stop operations as containers might already be stopped
             
             logger.info("Containers stopped successfully")
             if result.stdout:
-                logger.info(f"Command output: {result.stdout}")
+                logger.info("Command output: %s", result.stdout)
             
             return {
                 'success': True,
@@ -439,46 +1180,221 @@ class DockerComposeIntegration:
             logger.error(f"Unexpected error stopping containers: {e}")
             raise DockerComposeError(f"Failed to stop containers: {e}")
     
+    async def start_containers_async(
+        self,
+        services: Optional[List[str]] = None,
+        env_file: Optional[str] = None,
+        detached: bool = True,
+        build: bool = False,
+        wait_timeout: int = 300,
+        health_check: bool = True,
+        parallelism: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        parallel_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Start Docker Compose containers without blocking the event loop.
+        
+        Same arguments and result as start_containers. Lets several compose
+        projects be brought up concurrently, e.g. with ``asyncio.gather``.
+        
+        Returns:
+            Dictionary with operation results
+        """
+        logger.info("Starting Docker Compose containers")
+        self._check_start_prerequisites(env_file)
+        if batch_size is not None and not detached:
+            raise DockerComposeError("batch_size requires detached mode")
+        
+        logger.info(f"Starting containers: {services or 'all services'} (build={build})")
+        try:
+            if batch_size is not None:
+                output = await self._up_in_batches(
+                    services, build, wait_timeout, health_check, parallelism, batch_size,
+                    parallel_limit
+                )
+                wait_in_up = True
+            else:
+                up_cmd, timeout, wait_in_up = self._up_command(
+                    services, detached, build, wait_timeout, health_check, parallelism
+                )
+                result = await self._run_compose_command_async(
+                    up_cmd, timeout=timeout, parallel_limit=parallel_limit
+                )
+                
+                if result.returncode != 0:
+                    logger.error("Container startup failed: %s", result.stderr)
+                    raise DockerComposeError(f"Failed to start containers: {result.stderr}")
+                output = result.stdout
+        except subprocess.TimeoutExpired:
+            error_msg = f"Container startup timed out after {wait_timeout} seconds"
+            logger.error(error_msg)
+            raise DockerComposeError(error_msg)
+        
+        logger.info("Containers started successfully")
+        
+        # Wait for services to be healthy if requested
+        if health_check and detached and not wait_in_up:
+            if not await self._wait_for_services_async(services, wait_timeout):
+                logger.warning("Some services may not be healthy, but continuing...")
+        
+        return {
+            'success': True,
+            'services': services or 'all',
+            'message': 'Containers started successfully',
+            'command_output': output
+        }
+    
+    async def stop_containers_async(
+        self,
+        services: Optional[List[str]] = None,
+        cleanup: bool = False,
+        remove_volumes: bool = False,
+        timeout: int = 30,
+        parallelism: Optional[int] = None,
+        parallel_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Stop Docker Compose containers without blocking the event loop.
+        
+        Same arguments and result as stop_containers.
+        
+        Returns:
+            Dictionary with operation results
+        """
+        logger.info("Stopping Docker Compose containers")
+        
+        # Files may be removed or regenerated before the next start
+        _path_exists.cache_clear()
+        
+        if not self._check_docker_compose():
+            raise DockerComposeError("Docker Compose is not available")
+        
+        stop_cmd = self._stop_command(services, cleanup, remove_volumes, timeout, parallelism)
+        try:
+            result = await self._run_compose_command_async(
+                stop_cmd, timeout=timeout + 60, parallel_limit=parallel_limit
+            )
+        except subprocess.TimeoutExpired:
+            error_msg = f"Container stop timed out after {timeout + 60} seconds"
+            logger.error(error_msg)
+            raise DockerComposeError(error_msg)
+        
+        if result.returncode != 0:
+            # Don't raise error for stop operations as containers might already be stopped
+            logger.warning("Stop command completed with warnings: %s", result.stderr)
+        
+        logger.info("Containers stopped successfully")
+        return {
+            'success': True,
+            'services': services or 'all',
+            'cleanup': cleanup,
+            'message': 'Containers stopped successfully',
+            'command_output': result.stdout
+        }
+    
+    def run_lifecycle(
+        self,
+        services: Optional[List[str]] = None,
+        timeout: int = 300
+    ) -> Dict[str, Any]:
+        """
+        Start services, wait until they are healthy, then tear them down.
+        
+        A smoke test of the compose file in two compose invocations
+        (``up --wait`` and ``down -v``) rather than start, status and stop;
+        health is taken from the exit code of ``up --wait``. Requires
+        Compose v2.
+        
+        Args:
+            services: List of specific services to start (None for all)
+            timeout: Timeout for services to become healthy
+            
+        Returns:
+            Dictionary with operation results
+        """
+        if self._get_compose_command() != ['docker', 'compose']:
+            raise DockerComposeError("Lifecycle check requires 'docker compose' (v2) for --wait")
+        
+        up_cmd = ['up', '--wait', '--wait-timeout', str(timeout)]
+        if services:
+            up_cmd.extend(services)
+        
+        logger.info(f"Running lifecycle check: {services or 'all services'}")
+        try:
+            result = self._run_compose_command(up_cmd, timeout=timeout + 60)
+        except subprocess.TimeoutExpired:
+            raise DockerComposeError(f"Lifecycle check timed out after {timeout + 60} seconds")
+        finally:
+            down = self._run_compose_command(['down', '-v'], timeout=120)
+            if down.returncode != 0:
+                logger.warning("Lifecycle teardown completed with warnings: %s", down.stderr)
+        
+        if result.returncode != 0:
+            logger.error("Lifecycle check failed: %s", result.stderr)
+            return {
+                'success': False,
+                'services': services or 'all',
+                'error': result.stderr
+            }
+        
+        return {
+            'success': True,
+            'services': services or 'all',
+            'message': 'Containers started healthy and were removed',
+            'command_output': result.stdout
+        }
+    
     def get_container_status(self) -> Dict[str, Any]:
         """Get status of Docker Compose containers."""
         logger.info("Getting container status")
         
         try:
-            result = self._run_compose_command(['ps', '--format', 'json'], timeout=30)
-            
-            if result.returncode != 0:
-                logger.warning(f"Failed to get container status: {result.stderr}")
-                return {'success': False, 'error': result.stderr}
-            
-            # Parse container status
+            # Stream NDJSON records rather than buffering the whole output
+            containers = list(self._stream_compose_json(['ps', '--format', 'json']))
+        except DockerComposeError as e:
+            logger.warning(f"Failed to get container status: {e}")
+            return {'success': False, 'error': str(e)}
+        except ValueError as e:
+            logger.warning(f"Could not parse container status: {e}")
             containers = []
-            output = result.stdout.strip()
-            
-            if output:
-                try:
-                    # Try parsing as JSON lines
-                    for line in output.split('\n'):
-                        if line.strip():
-                            container_info = json.loads(line)
-                            containers.append(container_info)
-                except json.JSONDecodeError:
-                    # Try parsing as single JSON object
-                    try:
-                        containers_data = json.loads(output)
-                        if isinstance(containers_data, list):
-                            containers = containers_data
-                    except json.JSONDecodeError:
-                        logger.warning(f"Could not parse container status: {output}")
-            
-            return {
-                'success': True,
-                'containers': containers,
-                'count': len(containers)
-            }
-            
         except Exception as e:
             logger.error(f"Error getting container status: {e}")
             return {'success': False, 'error': str(e)}
+        
+        return {
+            'success': True,
+            'containers': containers,
+            'count': len(containers)
+        }
+
+
+def _get_integration(compose_file: str,
+                     working_directory: Optional[str]) -> DockerComposeIntegration:
+    """
+    Get the shared DockerComposeIntegration for a compose project.
+    
+    Hooks fire several times per CFNgin run; reusing the instance keeps the
+    Docker client connection and compose file stat out of each hook call.
+    
+    Args:
+        compose_file: Path to docker-compose.yml file
+        working_directory: Directory to run commands from (None for cwd)
+        
+    Returns:
+        Cached or newly created integration instance
+    """
+    working_directory = os.path.abspath(working_directory or os.getcwd())
+    key = (compose_file, working_directory)
+    with _INTEGRATION_LOCK:
+        integration = _INTEGRATION_CACHE.get(key)
+        if integration is None:
+            integration = DockerComposeIntegration(
+                compose_file=compose_file,
+                working_directory=working_directory
+            )
+            _INTEGRATION_CACHE[key] = integration
+    return integration
 
 
 def start_containers_hook(
@@ -490,6 +1406,9 @@ def start_containers_hook(
     wait_timeout: int = 300,
     health_check: bool = True,
     working_directory: Optional[str] = None,
+    parallelism: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    parallel_limit: Optional[int] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -504,6 +1423,10 @@ def start_containers_hook(
         wait_timeout: Timeout for waiting for services
         health_check: Whether to wait for health checks
         working_directory: Directory to run commands from
+        parallelism: Max concurrent Compose engine operations
+        batch_size: Max concurrent ``up`` calls when starting services in
+            dependency order (None for a single ``up``)
+        parallel_limit: COMPOSE_PARALLEL_LIMIT for the compose commands
         **kwargs: Additional arguments
         
     Returns:
@@ -512,17 +1435,17 @@ def start_containers_hook(
     logger.info("CFNgin Docker Compose start hook called")
     
     try:
-        integration = DockerComposeIntegration(
-            compose_file=compose_file,
-            working_directory=working_directory
-        )
+        integration = _get_integration(compose_file, working_directory)
         
         result = integration.start_containers(
             services=services,
             env_file=env_file,
             build=build,
             wait_timeout=wait_timeout,
-            health_check=health_check
+            health_check=health_check,
+            parallelism=parallelism,
+            batch_size=batch_size,
+            parallel_limit=parallel_limit
         )
         
         logger.info("Docker Compose start hook completed successfully")
@@ -544,6 +1467,8 @@ def stop_containers_hook(
     remove_volumes: bool = False,
     timeout: int = 30,
     working_directory: Optional[str] = None,
+    parallelism: Optional[int] = None,
+    parallel_limit: Optional[int] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -557,6 +1482,8 @@ def stop_containers_hook(
         remove_volumes: Whether to remove volumes during cleanup
         timeout: Timeout for stopping containers
         working_directory: Directory to run commands from
+        parallelism: Max concurrent Compose engine operations
+        parallel_limit: COMPOSE_PARALLEL_LIMIT for the compose commands
         **kwargs: Additional arguments
         
     Returns:
@@ -565,16 +1492,15 @@ def stop_containers_hook(
     logger.info("CFNgin Docker Compose stop hook called")
     
     try:
-        integration = DockerComposeIntegration(
-            compose_file=compose_file,
-            working_directory=working_directory
-        )
+        integration = _get_integration(compose_file, working_directory)
         
         result = integration.stop_containers(
             services=services,
             cleanup=cleanup,
             remove_volumes=remove_volumes,
-            timeout=timeout
+            timeout=timeout,
+            parallelism=parallelism,
+            parallel_limit=parallel_limit
         )
         
         logger.info("Docker Compose stop hook completed successfully")
@@ -588,8 +1514,9 @@ def stop_containers_hook(
         raise DockerComposeError(f"Stop hook execution failed: {e}")
 
 
-def main():
-    """Command line interface for Docker Compose integration."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser on first use; hook imports never pay for it."""
     parser = argparse.ArgumentParser(
         description='Docker Compose integration for Runway deployments',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -650,6 +1577,16 @@ Examples:
         action='store_true',
         help='Skip health check waiting'
     )
+    start_parser.add_argument(
+        '--parallel',
+        type=int,
+        help='Max concurrent Compose engine operations (Compose v2.22+)'
+    )
+    start_parser.add_argument(
+        '--batch-size',
+        type=int,
+        help='Start services in dependency order, at most N at once'
+    )
     start_parser.add_argument(
         '--working-directory', '-C',
         help='Directory to run commands from'
@@ -683,6 +1620,11 @@ Examples:
         default=30,
         help='Timeout for stopping containers (default: 30)'
     )
+    stop_parser.add_argument(
+        '--parallel',
+        type=int,
+        help='Max concurrent Compose engine operations (Compose v2.22+)'
+    )
     stop_parser.add_argument(
         '--working-directory', '-C',
         help='Directory to run commands from'
@@ -700,6 +1642,12 @@ Examples:
         help='Directory to run commands from'
     )
     
+    return parser
+
+
+def main():
+    """Command line interface for Docker Compose integration."""
+    parser = _build_parser()
     args = parser.parse_args()
     
     if not args.command:
@@ -718,7 +1666,9 @@ Examples:
                 env_file=args.env_file,
                 build=args.build,
                 wait_timeout=args.wait_timeout,
-                health_check=not args.no_health_check
+                health_check=not args.no_health_check,
+                parallelism=args.parallel,
+                batch_size=args.batch_size
             )
             
         elif args.command == 'stop':
@@ -726,7 +1676,8 @@ Examples:
                 services=args.services,
                 cleanup=args.cleanup,
                 remove_volumes=args.remove_volumes,
-                timeout=args.timeout
+                timeout=args.timeout,
+                parallelism=args.parallel
             )
             
         elif args.command == 'status':